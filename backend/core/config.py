@@ -50,6 +50,7 @@ class Settings(BaseSettings):
 
     # 알림 설정
     alert_check_interval_minutes: int = 5
+    alert_concurrency: int = 8  # 알림 규칙 동시 평가/발송 수
 
     # Google Gemini AI 설정
     gemini_api_key: Optional[str] = None
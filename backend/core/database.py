@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from .config import get_settings
@@ -12,6 +12,7 @@ engine = create_engine(
     max_overflow=20,
     pool_pre_ping=True,
     pool_recycle=1800,
+    query_cache_size=1200,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -23,6 +24,7 @@ async_engine = create_async_engine(
     max_overflow=20,
     pool_pre_ping=True,
     pool_recycle=1800,
+    query_cache_size=1200,
 )
 async_session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -45,3 +47,31 @@ async def get_async_db():
             yield session
         finally:
             await session.close()
+
+
+def create_indexes_concurrently(bind, indexes: dict[str, str]) -> None:
+    """CREATE INDEX CONCURRENTLY 문을 하나의 AUTOCOMMIT 연결에서 순서대로 실행 (마이그레이션 스크립트용).
+
+    Args:
+        bind: 동기 엔진
+        indexes: 인덱스 이름 → CREATE [UNIQUE] INDEX CONCURRENTLY IF NOT EXISTS ... 문
+
+    CONCURRENTLY는 트랜잭션 밖에서만 가능하고, 같은 테이블의 동시 생성은 서로 기다리므로 순차 실행.
+    중간에 실패하면 INVALID 인덱스가 남고 IF NOT EXISTS로는 복구되지 않으므로 삭제 후 RuntimeError.
+    """
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            for sql in indexes.values():
+                conn.execute(text(sql))
+        finally:
+            invalid = conn.execute(text("""
+                SELECT c.relname
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = ANY(:names)
+                  AND NOT i.indisvalid
+            """), {"names": list(indexes)}).scalars().all()
+            for name in invalid:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    if invalid:
+        raise RuntimeError(f"인덱스 생성 실패 (INVALID → 삭제함, 재실행 필요): {', '.join(invalid)}")
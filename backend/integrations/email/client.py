@@ -1,4 +1,5 @@
 """이메일 SMTP 클라이언트."""
+import asyncio
 import logging
 import smtplib
 from email.mime.text import MIMEText
@@ -178,6 +179,22 @@ Investment Tracker 알림 시스템
             html_body=html_body,
         )
 
+    async def send_alert_async(
+        self,
+        to_email: str,
+        title: str,
+        message: str,
+        alert_type: Optional[str] = None,
+    ) -> bool:
+        """send_alert를 스레드에서 실행 (SMTP 블로킹이 이벤트 루프를 막지 않도록)."""
+        return await asyncio.to_thread(
+            self.send_alert,
+            to_email=to_email,
+            title=title,
+            message=message,
+            alert_type=alert_type,
+        )
+
     def test_connection(self) -> bool:
         """
         SMTP 연결 테스트.
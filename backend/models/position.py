@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Integer, Numeric, Date, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, String, Integer, Numeric, Date, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -30,6 +30,13 @@ class Position(Base):
 
     idea = relationship("InvestmentIdea", back_populates="positions")
 
+    __table_args__ = (
+        # 청산 포지션 조회 (exit_date 범위/정렬) + 아이디어 조인
+        Index("ix_positions_exit_date_idea", "exit_date", "idea_id"),
+        # 보유 중(미청산) 포지션만 담는 부분 인덱스
+        Index("ix_positions_open_idea", "idea_id", postgresql_where=exit_date.is_(None)),
+    )
+
     @property
     def is_open(self) -> bool:
         return self.exit_date is None
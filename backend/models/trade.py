@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime, date
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, String, Integer, Numeric, Date, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, String, Integer, Numeric, Date, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -46,3 +46,8 @@ class Trade(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     position = relationship("Position", backref="trades")
+
+    __table_args__ = (
+        # 매도 거래 조회 (trade_type 필터 + trade_date 범위/정렬)
+        Index("ix_trades_type_date", "trade_type", "trade_date"),
+    )
@@ -2,11 +2,11 @@
 import logging
 import asyncio
 
-from sqlalchemy import select, distinct
+from sqlalchemy import select
 
 from core.database import async_session_maker
 from core.timezone import today_kst
-from models import StockOHLCV, InvestmentIdea
+from models import InvestmentIdea
 from services.ohlcv_service import OHLCVService, is_trading_day
 from scheduler.job_tracker import track_job_execution
 
@@ -27,10 +27,10 @@ async def collect_ohlcv_daily():
     logger.info("OHLCV 일별 수집 시작")
 
     async with async_session_maker() as session:
+        service = OHLCVService(session)
+
         # 저장된 종목 목록 조회
-        stmt = select(distinct(StockOHLCV.stock_code))
-        result = await session.execute(stmt)
-        codes = [row[0] for row in result.all()]
+        codes = await service.get_stock_codes()
 
         if not codes:
             logger.info("저장된 OHLCV 종목 없음")
@@ -38,7 +38,6 @@ async def collect_ohlcv_daily():
 
         logger.info(f"업데이트 대상: {len(codes)}개 종목")
 
-        service = OHLCVService(session)
         success = 0
         failed = 0
 
@@ -86,10 +85,10 @@ async def collect_ohlcv_for_new_ideas():
             logger.info("아이디어에 등록된 종목 없음")
             return
 
+        service = OHLCVService(session)
+
         # 이미 OHLCV가 있는 종목
-        stmt = select(distinct(StockOHLCV.stock_code))
-        result = await session.execute(stmt)
-        existing_codes = {row[0] for row in result.all()}
+        existing_codes = set(await service.get_stock_codes())
 
         # 신규 종목
         new_codes = idea_codes - existing_codes
@@ -100,7 +99,6 @@ async def collect_ohlcv_for_new_ideas():
 
         logger.info(f"신규 종목 {len(new_codes)}개 OHLCV 수집")
 
-        service = OHLCVService(session)
         for code in new_codes:
             try:
                 count = await service.collect_ohlcv(code, days=240)
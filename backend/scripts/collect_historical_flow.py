@@ -11,6 +11,7 @@ import time
 # 상위 디렉토리를 path에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
 from pykrx import stock
 from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import insert
@@ -22,6 +23,31 @@ from models.stock_investor_flow import StockInvestorFlow
 from services.theme_map_service import get_theme_map_service
 
 
+try:
+    from tqdm import tqdm
+except ImportError:
+    class tqdm:
+        """tqdm 미설치 시 대체: 100건마다 진행률만 출력."""
+
+        def __init__(self, items, **kwargs):
+            self.items = items
+            self.postfix = {}
+
+        def __iter__(self):
+            total = len(self.items)
+            for i, item in enumerate(self.items, 1):
+                yield item
+                if i % 100 == 0 or i == total:
+                    stats = ", ".join(f"{k}={v}" for k, v in self.postfix.items())
+                    print(f"--- 진행률: {i}/{total} ({i / total * 100:.1f}%) {stats} ---", flush=True)
+
+        def set_description(self, desc, refresh=True):
+            pass
+
+        def set_postfix(self, refresh=True, **kwargs):
+            self.postfix = kwargs
+
+
 def load_theme_stocks() -> dict[str, str]:
     """테마맵에서 종목코드 -> 종목명 딕셔너리 로드."""
     tms = get_theme_map_service()
@@ -69,66 +95,61 @@ def get_investor_flow_pykrx(stock_code: str, start_date: str, end_date: str) ->
         return []
 
 
-def calculate_flow_score(foreign_amount: int, institution_amount: int) -> float:
-    """수급 점수 계산 (0-100)."""
-    # 금액 기준 점수 (10억 단위)
-    score = 50.0
+def calculate_flow_scores(foreign_amounts: np.ndarray, institution_amounts: np.ndarray) -> np.ndarray:
+    """수급 점수 계산 (0-100, 종목 전체 일자를 한 번에 계산).
 
-    # 외국인 (최대 ±25점)
-    foreign_score = min(25, max(-25, foreign_amount / 10_000_000_000 * 25))
-    score += foreign_score
+    외국인/기관 순매수금액 100억당 ±25점, 각각 최대 ±25점.
+    """
+    foreign_score = np.clip(foreign_amounts / 10_000_000_000 * 25, -25, 25)
+    institution_score = np.clip(institution_amounts / 10_000_000_000 * 25, -25, 25)
+    return np.clip(50.0 + foreign_score + institution_score, 0, 100)
 
-    # 기관 (최대 ±25점)
-    institution_score = min(25, max(-25, institution_amount / 10_000_000_000 * 25))
-    score += institution_score
 
-    return max(0, min(100, score))
+_insert = insert(StockInvestorFlow)
+UPSERT_STMT = _insert.on_conflict_do_update(
+    index_elements=["stock_code", "flow_date"],
+    set_={
+        "stock_name": _insert.excluded.stock_name,
+        "foreign_net_amount": _insert.excluded.foreign_net_amount,
+        "institution_net_amount": _insert.excluded.institution_net_amount,
+        "individual_net_amount": _insert.excluded.individual_net_amount,
+        "flow_score": _insert.excluded.flow_score,
+    },
+)
 
 
 async def save_flow_data(stock_code: str, stock_name: str, flow_data: list[dict]):
-    """수급 데이터 DB 저장."""
+    """수급 데이터 DB 저장 (종목 단위 executemany upsert)."""
     if not flow_data:
         return 0
 
-    async with async_session_maker() as db:
-        saved_count = 0
-        for item in flow_data:
-            flow_date = datetime.strptime(item["date"], "%Y-%m-%d").date()
-            foreign_amount = item["foreign_net_amount"]
-            institution_amount = item["institution_net_amount"]
-            individual_amount = item["individual_net_amount"]
+    flow_scores = calculate_flow_scores(
+        np.array([item["foreign_net_amount"] for item in flow_data], dtype=np.float64),
+        np.array([item["institution_net_amount"] for item in flow_data], dtype=np.float64),
+    ).tolist()
 
+    rows = [
+        {
+            "stock_code": stock_code,
+            "stock_name": stock_name,
+            "flow_date": datetime.strptime(item["date"], "%Y-%m-%d").date(),
             # 수량은 금액/주가로 추정 (정확하지 않으므로 0으로 설정)
             # pykrx는 금액만 제공
-            flow_score = calculate_flow_score(foreign_amount, institution_amount)
-
-            stmt = insert(StockInvestorFlow).values(
-                stock_code=stock_code,
-                stock_name=stock_name,
-                flow_date=flow_date,
-                foreign_net=0,  # pykrx는 수량 미제공
-                institution_net=0,
-                individual_net=0,
-                foreign_net_amount=foreign_amount,
-                institution_net_amount=institution_amount,
-                individual_net_amount=individual_amount,
-                flow_score=flow_score,
-            ).on_conflict_do_update(
-                index_elements=['stock_code', 'flow_date'],
-                set_={
-                    'stock_name': stock_name,
-                    'foreign_net_amount': foreign_amount,
-                    'institution_net_amount': institution_amount,
-                    'individual_net_amount': individual_amount,
-                    'flow_score': flow_score,
-                }
-            )
-
-            await db.execute(stmt)
-            saved_count += 1
+            "foreign_net": 0,
+            "institution_net": 0,
+            "individual_net": 0,
+            "foreign_net_amount": item["foreign_net_amount"],
+            "institution_net_amount": item["institution_net_amount"],
+            "individual_net_amount": item["individual_net_amount"],
+            "flow_score": flow_score,
+        }
+        for item, flow_score in zip(flow_data, flow_scores)
+    ]
 
+    async with async_session_maker() as db:
+        await db.execute(UPSERT_STMT, rows)
         await db.commit()
-        return saved_count
+    return len(rows)
 
 
 async def main():
@@ -154,9 +175,10 @@ async def main():
     fail_count = 0
     total_records = 0
 
-    for i, code in enumerate(stock_codes):
+    pbar = tqdm(stock_codes, unit="stock")
+    for code in pbar:
         name = stocks[code]
-        print(f"[{i+1}/{total}] {name}({code})...", end=" ", flush=True)
+        pbar.set_description(f"{name}({code})", refresh=False)
 
         # pykrx 호출 (동기)
         flow_data = get_investor_flow_pykrx(code, start_str, end_str)
@@ -165,18 +187,13 @@ async def main():
             saved = await save_flow_data(code, name, flow_data)
             total_records += saved
             success_count += 1
-            print(f"{saved}일 저장")
         else:
             fail_count += 1
-            print("데이터 없음")
+        pbar.set_postfix(ok=success_count, fail=fail_count, rec=total_records, refresh=False)
 
         # API 속도 제한 (0.5초 대기)
         time.sleep(0.3)
 
-        # 진행률 출력 (50개마다)
-        if (i + 1) % 50 == 0:
-            print(f"\n--- 진행률: {i+1}/{total} ({(i+1)/total*100:.1f}%) ---\n")
-
     print()
     print("=== 수집 완료 ===")
     print(f"성공: {success_count}개 종목")
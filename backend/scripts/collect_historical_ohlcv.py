@@ -1,6 +1,7 @@
 """pykrx를 이용한 과거 1년치 OHLCV 데이터 수집.
 
 실행: cd backend && python scripts/collect_historical_ohlcv.py
+최초 대량 적재: python scripts/collect_historical_ohlcv.py --fast-init
 """
 import asyncio
 import sys
@@ -10,6 +11,7 @@ import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
 from pykrx import stock
 from sqlalchemy.dialects.postgresql import insert
 from core.database import async_session_maker
@@ -17,9 +19,35 @@ from core.timezone import now_kst
 from models.stock_ohlcv import StockOHLCV
 
 
+from services.ohlcv_service import copy_ohlcv_records
 from services.theme_map_service import get_theme_map_service
 
 
+try:
+    from tqdm import tqdm
+except ImportError:
+    class tqdm:
+        """tqdm 미설치 시 대체: 100건마다 진행률만 출력."""
+
+        def __init__(self, items, **kwargs):
+            self.items = items
+            self.postfix = {}
+
+        def __iter__(self):
+            total = len(self.items)
+            for i, item in enumerate(self.items, 1):
+                yield item
+                if i % 100 == 0 or i == total:
+                    stats = ", ".join(f"{k}={v}" for k, v in self.postfix.items())
+                    print(f"--- 진행률: {i}/{total} ({i / total * 100:.1f}%) {stats} ---", flush=True)
+
+        def set_description(self, desc, refresh=True):
+            pass
+
+        def set_postfix(self, refresh=True, **kwargs):
+            self.postfix = kwargs
+
+
 def load_theme_stocks() -> dict[str, str]:
     """테마맵에서 종목코드 -> 종목명 딕셔너리 로드."""
     tms = get_theme_map_service()
@@ -54,20 +82,26 @@ def get_ohlcv_pykrx(stock_code: str, start_date: str, end_date: str) -> list[dic
         if df.empty:
             return []
 
-        results = []
-        for date_idx, row in df.iterrows():
-            date_str = date_idx.strftime("%Y-%m-%d")
-            # 시가가 0이면 거래 없는 날로 간주 (스킵)
-            if row.get("시가", 0) == 0:
-                continue
-            results.append({
-                "date": date_str,
-                "open": int(row.get("시가", 0) or 0),
-                "high": int(row.get("고가", 0) or 0),
-                "low": int(row.get("저가", 0) or 0),
-                "close": int(row.get("종가", 0) or 0),
-                "volume": int(row.get("거래량", 0) or 0),
-            })
+        # 결측치/타입 변환을 pandas에서 일괄 처리
+        cols = ["시가", "고가", "저가", "종가", "거래량"]
+        df = df.fillna(0)
+        df[cols] = df[cols].astype(np.int64)
+        # 시가가 0이면 거래 없는 날로 간주 (스킵)
+        df = df[df["시가"] != 0]
+
+        dates = df.index.strftime("%Y-%m-%d")
+        opens, highs, lows, closes, volumes = (df[c].to_numpy().tolist() for c in cols)
+        results = [
+            {
+                "date": d,
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v,
+            }
+            for d, o, h, l, c, v in zip(dates, opens, highs, lows, closes, volumes)
+        ]
         return results
     except Exception as e:
         print(f"  {stock_code} 조회 실패: {e}")
@@ -110,7 +144,29 @@ async def save_ohlcv_data(stock_code: str, ohlcv_data: list[dict]):
         return saved_count
 
 
-async def main():
+async def copy_ohlcv_data(stock_code: str, ohlcv_data: list[dict]) -> int:
+    """COPY 경유 일괄 upsert (대량 적재용, 기존 행도 갱신)."""
+    if not ohlcv_data:
+        return 0
+
+    now = datetime.utcnow()
+    records = [
+        (
+            stock_code,
+            datetime.strptime(item["date"], "%Y-%m-%d").date(),
+            item["open"], item["high"], item["low"],
+            item["close"], item["volume"], now,
+        )
+        for item in ohlcv_data
+    ]
+
+    async with async_session_maker() as db:
+        saved = await copy_ohlcv_records(db, records)
+        await db.commit()
+    return saved
+
+
+async def main(fast_init: bool = False):
     # 종목 로드
     stocks = load_theme_stocks()
     stock_codes = list(stocks.keys())
@@ -133,29 +189,28 @@ async def main():
     fail_count = 0
     total_records = 0
 
-    for i, code in enumerate(stock_codes):
+    pbar = tqdm(stock_codes, unit="stock")
+    for code in pbar:
         name = stocks[code]
-        print(f"[{i+1}/{total}] {name}({code})...", end=" ", flush=True)
+        pbar.set_description(f"{name}({code})", refresh=False)
 
         # pykrx 호출 (동기)
         ohlcv_data = get_ohlcv_pykrx(code, start_str, end_str)
 
         if ohlcv_data:
-            saved = await save_ohlcv_data(code, ohlcv_data)
+            if fast_init:
+                saved = await copy_ohlcv_data(code, ohlcv_data)
+            else:
+                saved = await save_ohlcv_data(code, ohlcv_data)
             total_records += saved
             success_count += 1
-            print(f"{saved}일 저장")
         else:
             fail_count += 1
-            print("데이터 없음")
+        pbar.set_postfix(ok=success_count, fail=fail_count, rec=total_records, refresh=False)
 
         # API 속도 제한 (0.2초 대기 - OHLCV는 더 빠름)
         time.sleep(0.2)
 
-        # 진행률 출력 (100개마다)
-        if (i + 1) % 100 == 0:
-            print(f"\n--- 진행률: {i+1}/{total} ({(i+1)/total*100:.1f}%) ---\n")
-
     print()
     print("=== 수집 완료 ===")
     print(f"성공: {success_count}개 종목")
@@ -164,4 +219,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description="과거 1년치 OHLCV 수집")
+    parser.add_argument("--fast-init", action="store_true",
+                        help="COPY 기반 대량 적재 (결과는 일반 모드와 같이 기존 행도 갱신)")
+
+    args = parser.parse_args()
+    asyncio.run(main(fast_init=args.fast_init))
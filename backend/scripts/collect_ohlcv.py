@@ -27,7 +27,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import select
 from core.database import async_session_maker, async_engine, Base
-from models import InvestmentIdea, StockOHLCV
+from models import InvestmentIdea
 from services.ohlcv_service import OHLCVService
 
 
@@ -104,15 +104,13 @@ async def collect_single(stock_code: str, days: int = 240):
 async def collect_daily():
     """일별 업데이트 (모든 저장된 종목)."""
     async with async_session_maker() as session:
+        service = OHLCVService(session)
+
         # 저장된 종목 목록 조회
-        from sqlalchemy import distinct
-        stmt = select(distinct(StockOHLCV.stock_code))
-        result = await session.execute(stmt)
-        codes = [row[0] for row in result.all()]
+        codes = await service.get_stock_codes()
 
         print(f"일별 업데이트: {len(codes)}개 종목")
 
-        service = OHLCVService(session)
         success = 0
 
         for code in codes:
@@ -5,24 +5,31 @@ ThreadPoolExecutor로 10개 워커 병렬 처리.
 bulk upsert로 빠른 DB 저장.
 
 실행: cd backend && python -u scripts/collect_ohlcv_2022_2023.py
+최초 대량 적재: python -u scripts/collect_ohlcv_2022_2023.py --fast-init
 """
 import asyncio
 import sys
 import os
 import time
 from datetime import datetime, date as date_type
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import FinanceDataReader as fdr
+import numpy as np
 from sqlalchemy import select, func, and_
 from sqlalchemy.dialects.postgresql import insert
 from core.database import async_session_maker
 from models.stock_ohlcv import StockOHLCV
+from services.ohlcv_service import copy_ohlcv_records
 
 WORKERS = 10
-BATCH_DB_SIZE = 500  # bulk upsert 단위
+BATCH_DB_SIZE = 5000  # bulk upsert 단위
+# executemany 1회당 최대 행 수 (PostgreSQL 배치 처리량이 가장 좋은 구간)
+UPSERT_CHUNK_SIZE = 5000
+DB_CONCURRENCY = 2  # 동시 DB 저장 작업(writer) 수
+DB_QUEUE_SIZE = 20  # 저장 대기 배치 수 상한
 
 
 def log(msg: str):
@@ -36,27 +43,27 @@ def fetch_ohlcv_fdr(stock_code: str, start: str, end: str) -> list[dict]:
         if df is None or df.empty:
             return []
 
-        results = []
-        for idx, row in df.iterrows():
-            trade_date = idx.strftime("%Y-%m-%d")
-            open_val = int(row.get("Open", 0) or 0)
-            if open_val <= 0:
-                continue
-            close_val = int(row.get("Close", 0) or 0)
-            if close_val <= 0:
-                continue
-            dt = idx.to_pydatetime()
-            if dt.weekday() >= 5:
-                continue
-            results.append({
+        # 결측치/타입 변환을 pandas에서 일괄 처리
+        cols = ["Open", "High", "Low", "Close", "Volume"]
+        df = df.fillna(0)
+        df[cols] = df[cols].astype(np.int64)
+        # FDR은 거래일만 반환하므로 별도 주말 필터 불필요
+        df = df[(df["Open"] > 0) & (df["Close"] > 0)]
+
+        dates = df.index.strftime("%Y-%m-%d")
+        opens, highs, lows, closes, volumes = (df[c].to_numpy().tolist() for c in cols)
+        results = [
+            {
                 "stock_code": stock_code,
-                "trade_date": trade_date,
-                "open_price": open_val,
-                "high_price": int(row.get("High", 0) or 0),
-                "low_price": int(row.get("Low", 0) or 0),
-                "close_price": close_val,
-                "volume": int(row.get("Volume", 0) or 0),
-            })
+                "trade_date": d,
+                "open_price": o,
+                "high_price": h,
+                "low_price": l,
+                "close_price": c,
+                "volume": v,
+            }
+            for d, o, h, l, c, v in zip(dates, opens, highs, lows, closes, volumes)
+        ]
         return results
     except Exception:
         return []
@@ -65,11 +72,8 @@ def fetch_ohlcv_fdr(stock_code: str, start: str, end: str) -> list[dict]:
 async def get_stocks_needing_data() -> list[str]:
     """2022~2023년 데이터가 부족한 종목 목록 조회."""
     async with async_session_maker() as db:
-        all_stmt = select(func.distinct(StockOHLCV.stock_code))
-        all_result = await db.execute(all_stmt)
-        all_codes = {row[0] for row in all_result.fetchall()}
-
-        enough_stmt = (
+        # 충분한 데이터 종목을 CTE로 구하고 서버에서 차집합 계산 (1회 왕복)
+        enough = (
             select(StockOHLCV.stock_code)
             .where(and_(
                 StockOHLCV.trade_date >= date_type(2022, 1, 1),
@@ -77,12 +81,29 @@ async def get_stocks_needing_data() -> list[str]:
             ))
             .group_by(StockOHLCV.stock_code)
             .having(func.count() >= 400)
+            .cte("enough")
+        )
+        stmt = (
+            select(StockOHLCV.stock_code)
+            .distinct()
+            .where(StockOHLCV.stock_code.not_in(select(enough.c.stock_code)))
+            .order_by(StockOHLCV.stock_code)
         )
-        enough_result = await db.execute(enough_stmt)
-        enough_codes = {row[0] for row in enough_result.fetchall()}
+        result = await db.execute(stmt)
+        return [row[0] for row in result.fetchall()]
 
-        need_codes = all_codes - enough_codes
-        return sorted(need_codes)
+
+_insert = insert(StockOHLCV)
+UPSERT_STMT = _insert.on_conflict_do_update(
+    index_elements=["stock_code", "trade_date"],
+    set_={
+        "open_price": _insert.excluded.open_price,
+        "high_price": _insert.excluded.high_price,
+        "low_price": _insert.excluded.low_price,
+        "close_price": _insert.excluded.close_price,
+        "volume": _insert.excluded.volume,
+    },
+)
 
 
 async def bulk_upsert(rows: list[dict]) -> int:
@@ -96,23 +117,37 @@ async def bulk_upsert(rows: list[dict]) -> int:
             if isinstance(r["trade_date"], str):
                 r["trade_date"] = datetime.strptime(r["trade_date"], "%Y-%m-%d").date()
 
-        stmt = insert(StockOHLCV).values(rows)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["stock_code", "trade_date"],
-            set_={
-                "open_price": stmt.excluded.open_price,
-                "high_price": stmt.excluded.high_price,
-                "low_price": stmt.excluded.low_price,
-                "close_price": stmt.excluded.close_price,
-                "volume": stmt.excluded.volume,
-            },
-        )
-        await db.execute(stmt)
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            # VALUES를 인라인하지 않고 executemany로 실행 (prepared statement 재사용)
+            await db.execute(UPSERT_STMT, rows[i:i + UPSERT_CHUNK_SIZE])
         await db.commit()
     return len(rows)
 
 
-async def main():
+async def copy_insert(rows: list[dict]) -> int:
+    """COPY 경유 일괄 upsert (대량 적재용, 기존 행도 갱신)."""
+    if not rows:
+        return 0
+
+    now = datetime.utcnow()
+    records = [
+        (
+            r["stock_code"],
+            datetime.strptime(r["trade_date"], "%Y-%m-%d").date()
+            if isinstance(r["trade_date"], str) else r["trade_date"],
+            r["open_price"], r["high_price"], r["low_price"],
+            r["close_price"], r["volume"], now,
+        )
+        for r in rows
+    ]
+
+    async with async_session_maker() as db:
+        saved = await copy_ohlcv_records(db, records)
+        await db.commit()
+    return saved
+
+
+async def main(fast_init: bool = False):
     start_time = time.time()
 
     need_codes = await get_stocks_needing_data()
@@ -129,53 +164,69 @@ async def main():
     success = 0
     fail = 0
     total_records = 0
-    pending_rows: list[dict] = []
 
-    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
-        future_to_code = {
-            executor.submit(fetch_ohlcv_fdr, code, "2022-01-01", "2023-12-31"): code
-            for code in need_codes
-        }
+    # fetch 결과 소비(producer)와 DB 저장(writer)을 분리하여 동시 실행.
+    # Queue maxsize로 writer가 밀리면 producer가 대기 (메모리 상한)
+    queue: asyncio.Queue[list[dict] | None] = asyncio.Queue(maxsize=DB_QUEUE_SIZE)
+    save_batch = copy_insert if fast_init else bulk_upsert
 
-        done_count = 0
-        for future in as_completed(future_to_code):
-            code = future_to_code[future]
-            done_count += 1
+    async def producer():
+        nonlocal success, fail, total_records
+        pending_rows: list[dict] = []
+        loop = asyncio.get_running_loop()
 
-            try:
-                data = future.result()
-                if data:
-                    pending_rows.extend(data)
-                    success += 1
-                    total_records += len(data)
-                else:
-                    fail += 1
-            except Exception:
-                fail += 1
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            futures = [
+                loop.run_in_executor(executor, fetch_ohlcv_fdr, code, "2022-01-01", "2023-12-31")
+                for code in need_codes
+            ]
+
+            done_count = 0
+            for future in asyncio.as_completed(futures):
+                done_count += 1
 
-            # bulk upsert: BATCH_DB_SIZE 도달 시 DB 저장
-            if len(pending_rows) >= BATCH_DB_SIZE:
                 try:
-                    await bulk_upsert(pending_rows)
-                except Exception as e:
-                    log(f"  [DB ERROR] {e}")
-                pending_rows.clear()
-
-            # 진행률 (20개마다 또는 마지막)
-            if done_count % 20 == 0 or done_count == total:
-                elapsed = time.time() - start_time
-                speed = done_count / elapsed if elapsed > 0 else 0
-                eta = (total - done_count) / speed if speed > 0 else 0
-                log(f"  [{done_count}/{total}] {done_count/total*100:.1f}% | "
-                    f"ok={success} fail={fail} rec={total_records:,} | "
-                    f"{speed:.1f}/s ETA {eta/60:.0f}m")
-
-    # 남은 레코드 저장
-    if pending_rows:
-        try:
-            await bulk_upsert(pending_rows)
-        except Exception as e:
-            log(f"  [DB ERROR] 최종 저장 실패: {e}")
+                    data = await future
+                    if data:
+                        pending_rows.extend(data)
+                        success += 1
+                        total_records += len(data)
+                    else:
+                        fail += 1
+                except Exception:
+                    fail += 1
+
+                # BATCH_DB_SIZE 도달 시 writer로 전달
+                if len(pending_rows) >= BATCH_DB_SIZE:
+                    await queue.put(pending_rows)
+                    pending_rows = []
+
+                # 진행률 (20개마다 또는 마지막)
+                if done_count % 20 == 0 or done_count == total:
+                    elapsed = time.time() - start_time
+                    speed = done_count / elapsed if elapsed > 0 else 0
+                    eta = (total - done_count) / speed if speed > 0 else 0
+                    log(f"  [{done_count}/{total}] {done_count/total*100:.1f}% | "
+                        f"ok={success} fail={fail} rec={total_records:,} | "
+                        f"{speed:.1f}/s ETA {eta/60:.0f}m")
+
+        # 남은 레코드 저장 후 writer 종료 신호
+        if pending_rows:
+            await queue.put(pending_rows)
+        for _ in range(DB_CONCURRENCY):
+            await queue.put(None)
+
+    async def writer():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            try:
+                await save_batch(batch)
+            except Exception as e:
+                log(f"  [DB ERROR] {e}")
+
+    await asyncio.gather(producer(), *(writer() for _ in range(DB_CONCURRENCY)))
 
     elapsed = time.time() - start_time
     log("")
@@ -187,4 +238,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description="2022~2023년 OHLCV 수집")
+    parser.add_argument("--fast-init", action="store_true",
+                        help="COPY 기반 대량 적재 (결과는 일반 모드와 같이 기존 행도 갱신)")
+
+    args = parser.parse_args()
+    asyncio.run(main(fast_init=args.fast_init))
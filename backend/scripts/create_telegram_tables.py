@@ -6,14 +6,14 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import text
-from core.database import async_engine
+from core.database import async_engine, engine, create_indexes_concurrently
 
 
 async def create_tables():
     """텔레그램 관련 테이블 생성."""
 
-    # 각 SQL 문을 개별로 실행
-    statements = [
+    # 테이블 생성 (인덱스보다 먼저 실행되어야 함)
+    table_statements = [
         # telegram_channels 테이블
         """
         CREATE TABLE IF NOT EXISTS telegram_channels (
@@ -27,8 +27,6 @@ async def create_tables():
             last_message_id BIGINT NOT NULL DEFAULT 0
         )
         """,
-        "CREATE INDEX IF NOT EXISTS ix_telegram_channels_enabled ON telegram_channels(is_enabled)",
-        "CREATE INDEX IF NOT EXISTS ix_telegram_channels_channel_id ON telegram_channels(channel_id)",
 
         # telegram_keyword_matches 테이블
         """
@@ -46,19 +44,34 @@ async def create_tables():
             notification_sent BOOLEAN NOT NULL DEFAULT FALSE
         )
         """,
-        "CREATE INDEX IF NOT EXISTS ix_telegram_keyword_matches_created ON telegram_keyword_matches(created_at)",
-        "CREATE INDEX IF NOT EXISTS ix_telegram_keyword_matches_keyword ON telegram_keyword_matches(matched_keyword)",
-        """
-        CREATE UNIQUE INDEX IF NOT EXISTS ix_telegram_keyword_matches_channel_msg
-            ON telegram_keyword_matches(channel_id, message_id)
-        """,
     ]
 
+    # 인덱스 (CONCURRENTLY: 쓰기 차단 없음, 하나의 AUTOCOMMIT 연결에서 순차 실행)
+    index_statements = {
+        "ix_telegram_channels_enabled":
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_channels_enabled ON telegram_channels(is_enabled)",
+        "ix_telegram_channels_channel_id":
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_channels_channel_id ON telegram_channels(channel_id)",
+        "ix_telegram_keyword_matches_created":
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_keyword_matches_created "
+            "ON telegram_keyword_matches(created_at)",
+        "ix_telegram_keyword_matches_keyword":
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_keyword_matches_keyword "
+            "ON telegram_keyword_matches(matched_keyword)",
+        "ix_telegram_keyword_matches_channel_msg":
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_keyword_matches_channel_msg "
+            "ON telegram_keyword_matches(channel_id, message_id)",
+    }
+
+    print("텔레그램 테이블 생성 중...")
     async with async_engine.begin() as conn:
-        print("텔레그램 테이블 생성 중...")
-        for i, sql in enumerate(statements):
+        for i, sql in enumerate(table_statements):
             await conn.execute(text(sql.strip()))
-            print(f"  [{i+1}/{len(statements)}] 완료")
+            print(f"  [테이블 {i+1}/{len(table_statements)}] 완료")
+
+    print("인덱스 생성 중...")
+    create_indexes_concurrently(engine, index_statements)
+    print(f"  [인덱스 {len(index_statements)}개] 완료")
 
     print("\n✓ 모든 테이블이 생성되었습니다.")
 
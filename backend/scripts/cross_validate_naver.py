@@ -8,6 +8,7 @@
     python scripts/cross_validate_naver.py --stock 950170
     python scripts/cross_validate_naver.py --audit
     python scripts/cross_validate_naver.py --audit --limit 50
+    python scripts/cross_validate_naver.py --audit --refresh
     python scripts/cross_validate_naver.py --recollect 950170
 """
 import asyncio
@@ -16,79 +17,165 @@ import os
 import io
 import re
 import argparse
+import functools
+import json
 import logging
-
-# Windows 콘솔 UTF-8 출력
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import httpx
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, or_, not_, func, bindparam
 from core.database import async_session_maker
+from core.timezone import today_kst
 from models.financial_statement import FinancialStatement
 
 logger = logging.getLogger(__name__)
 
 REVENUE_NAMES = ["매출액", "수익(매출액)", "영업수익", "매출"]
+AUDIT_CONCURRENCY = 16  # 네이버 동시 요청 수 상한
+
+# 네이버 재무분석(cop_analysis) 표 파싱용 정규식
+# 표를 한 번에 찾아 thead(연도 헤더)와 tbody(계정 행) 부분을 그룹으로 분리 (중간 슬라이스 없음)
+_ANALYSIS_TABLE = re.compile(r'cop_analysis(.*?</thead>)(.*?)(?:</table>|$)', re.DOTALL)
+_TH_YEARS = re.compile(r'<th[^>]*>\s*(\d{4}\.\d{2})\s*(?:<em>[^<]*</em>)?\s*</th>')
+_EST_ENT = re.compile(r'(\d{4}\.\d{2})\s*<em>\&#40;E\&#41;</em>')
+_EST_PAREN = re.compile(r'(\d{4}\.\d{2})\s*<em>\(E\)</em>')
+# 매출액 행 (금융사는 영업수익/수익). 표의 첫 행이 매출 계정이므로 가장 앞선 매칭을 사용
+_REVENUE_ROW = re.compile(r'(?:매출액|영업수익|수익).*?</th>(.*?)</tr>', re.DOTALL)
+_TD = re.compile(r'<td[^>]*>(.*?)</td>', re.DOTALL)
+_TAG = re.compile(r'<[^>]+>')
+_STRIP_TABLE = str.maketrans('', '', ',\n\t')
+
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """네이버 요청용 공유 클라이언트 (keep-alive 연결 재사용)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=15.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            },
+        )
+    return _client
 
 
-async def fetch_naver_financial(stock_code: str) -> dict:
-    """네이버 증권 메인 페이지에서 재무 요약 데이터 파싱.
+async def _close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-    Returns:
-        {
-            "annual": {"2024.12": 3086, ...},   # 억원
-            "quarterly": {"2024.09": 732, ...},  # 억원
-            "fs_type": "CFS" or "OFS",
-            "error": None or str,
-        }
-    """
-    result = {"annual": {}, "quarterly": {}, "fs_type": "CFS", "error": None}
 
-    url = f'https://finance.naver.com/item/main.naver?code={stock_code}'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-    }
+def _parse_int(v: str) -> int | None:
+    """정수 셀 값 파싱. 빈 칸·'-' 등은 예외 없이 None."""
+    digits = v[1:] if v[:1] == '-' else v
+    if digits.isdecimal():
+        return int(v)
+    return None
+
+
+# 네이버 조회 결과 일 단위 디스크 캐시 (--audit 반복 실행 시 재요청 방지)
+# 종목당 파일 하나를 덮어쓰고, 저장한 날짜가 오늘이 아니면 무효
+NAVER_CACHE_DIR = Path.home() / ".cache" / "stock_tracker" / "naver"
+_refresh_cache = False  # --refresh: 캐시를 읽지 않고 새로 조회 (결과는 다시 저장)
+
+
+def _naver_cache_path(stock_code: str) -> Path:
+    return NAVER_CACHE_DIR / f"{stock_code}.json"
 
+
+def _read_naver_cache(path: Path) -> dict | None:
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            resp = await client.get(url, headers=headers)
-            resp.raise_for_status()
-            text = resp.text
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.pop("cached_on", None) != f"{today_kst():%Y%m%d}":
+        return None
+    data["estimate_years"] = set(data.get("estimate_years", []))
+    return data
+
+
+def _write_naver_cache(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        **data,
+        "estimate_years": sorted(data.get("estimate_years", [])),
+        "cached_on": f"{today_kst():%Y%m%d}",
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)  # 원자적 교체
+
+
+def _cached_by_day(func):
+    """성공한 조회 결과를 종목별로 디스크에 캐시 (당일만 유효)."""
+    @functools.wraps(func)
+    async def wrapper(stock_code: str) -> dict:
+        path = _naver_cache_path(stock_code)
+        if not _refresh_cache:
+            cached = await asyncio.to_thread(_read_naver_cache, path)
+            if cached is not None:
+                return cached
+
+        result = await func(stock_code)
+        if not result.get("error"):
+            try:
+                await asyncio.to_thread(_write_naver_cache, path, result)
+            except OSError as e:
+                logger.debug(f"{stock_code} 캐시 저장 실패: {e}")
+        return result
 
+    return wrapper
+
+
+async def _download_naver_page(stock_code: str) -> str:
+    """네이버 증권 종목 메인 페이지 HTML 다운로드."""
+    url = f'https://finance.naver.com/item/main.naver?code={stock_code}'
+    resp = await _get_client().get(url)
+    resp.raise_for_status()
+    return resp.text
+
+
+def _parse_naver_financial(text: str) -> dict:
+    """종목 메인 페이지 HTML에서 재무 요약 파싱 (CPU 작업, 스레드에서 실행)."""
+    result = {"annual": {}, "quarterly": {}, "fs_type": "CFS", "error": None}
+
+    try:
         if len(text) < 1000:
             result["error"] = "페이지 로드 실패"
             return result
 
-        # cop_analysis 섹션 찾기
-        idx = text.find('cop_analysis')
-        if idx < 0:
-            result["error"] = "재무분석 섹션 없음"
+        # cop_analysis 표 찾기
+        table = _ANALYSIS_TABLE.search(text)
+        if not table:
+            result["error"] = "thead 없음" if 'cop_analysis' in text else "재무분석 섹션 없음"
             return result
 
-        section = text[idx:idx + 20000]
+        head, body = table.group(1), table.group(2)
+        if '</table>' in head:  # 재무분석 표에 thead가 없어 다른 표까지 넘어간 경우
+            result["error"] = "thead 없음"
+            return result
 
         # IFRS 유형 확인
-        if "IFRS개별" in section or "GAAP개별" in section:
+        if "IFRS개별" in head or "GAAP개별" in head:
             result["fs_type"] = "OFS"
 
         # 연도 헤더 파싱
-        th_years = re.findall(
-            r'<th[^>]*>\s*(\d{4}\.\d{2})\s*(?:<em>.*?</em>)?\s*</th>',
-            section,
-        )
+        th_years = _TH_YEARS.findall(head)
         if not th_years:
             result["error"] = "연도 헤더 없음"
             return result
 
         # 추정치(E) 연도 식별 - 여러 패턴 대응
         estimate_years = set()
-        for m in re.finditer(r'(\d{4}\.\d{2})\s*<em>\&#40;E\&#41;</em>', section):
-            estimate_years.add(m.group(1))
-        for m in re.finditer(r'(\d{4}\.\d{2})\s*<em>\(E\)</em>', section):
-            estimate_years.add(m.group(1))
+        estimate_years.update(_EST_ENT.findall(head))
+        estimate_years.update(_EST_PAREN.findall(head))
         result["estimate_years"] = estimate_years
 
         # 연간(앞 4개) vs 분기(뒤 6개) 분리
@@ -104,27 +191,7 @@ async def fetch_naver_financial(stock_code: str) -> dict:
         quarterly_years = th_years[annual_end:]
 
         # 매출액 행 파싱 (tbody 첫 번째 tr)
-        thead_end = section.find('</thead>')
-        if thead_end < 0:
-            result["error"] = "thead 없음"
-            return result
-
-        after_thead = section[thead_end:]
-
-        # 매출액 행의 td 값들 추출
-        revenue_row = re.search(
-            r'매출액.*?</th>(.*?)</tr>',
-            after_thead, re.DOTALL,
-        )
-        if not revenue_row:
-            # 영업수익 등 대안 시도
-            for alt in ["영업수익", "수익"]:
-                revenue_row = re.search(
-                    rf'{alt}.*?</th>(.*?)</tr>',
-                    after_thead, re.DOTALL,
-                )
-                if revenue_row:
-                    break
+        revenue_row = _REVENUE_ROW.search(body)
 
         if not revenue_row:
             result["error"] = "매출액 행 없음"
@@ -132,79 +199,144 @@ async def fetch_naver_financial(stock_code: str) -> dict:
 
         row_html = revenue_row.group(1)
         # td 값 추출 (whitespace 제거, comma 제거)
-        td_values = re.findall(r'<td[^>]*>(.*?)</td>', row_html, re.DOTALL)
-        clean_values = []
-        for td in td_values:
-            v = re.sub(r'<[^>]+>', '', td).strip()
-            v = v.replace(',', '').replace('&nbsp;', '').replace('\n', '').replace('\t', '')
-            clean_values.append(v)
+        clean_values = [
+            _TAG.sub('', td).translate(_STRIP_TABLE).replace('&nbsp;', '').strip()
+            for td in _TD.findall(row_html)
+        ]
 
         # 연도에 매핑 (인덱스 기반 - 중복 연도 대응)
         for i, year_str in enumerate(annual_years):
-            if i < len(clean_values) and clean_values[i]:
-                try:
-                    result["annual"][year_str] = int(clean_values[i])
-                except ValueError:
-                    pass
+            if i < len(clean_values):
+                value = _parse_int(clean_values[i])
+                if value is not None:
+                    result["annual"][year_str] = value
 
         offset = len(annual_years)
         for j, year_str in enumerate(quarterly_years):
             idx = offset + j
-            if idx < len(clean_values) and clean_values[idx]:
-                try:
-                    result["quarterly"][year_str] = int(clean_values[idx])
-                except ValueError:
-                    pass
-
+            if idx < len(clean_values):
+                value = _parse_int(clean_values[idx])
+                if value is not None:
+                    result["quarterly"][year_str] = value
         return result
 
-    except httpx.HTTPStatusError as e:
-        result["error"] = f"HTTP {e.response.status_code}"
-        return result
     except Exception as e:
         result["error"] = str(e)
         return result
 
 
+@_cached_by_day
+async def fetch_naver_financial(stock_code: str) -> dict:
+    """네이버 증권 메인 페이지에서 재무 요약 데이터 파싱.
+
+    다운로드는 이벤트 루프에서, HTML 파싱은 asyncio.to_thread로 수행한다.
+
+    Returns:
+        {
+            "annual": {"2024.12": 3086, ...},   # 억원
+            "quarterly": {"2024.09": 732, ...},  # 억원
+            "fs_type": "CFS" or "OFS",
+            "error": None or str,
+        }
+    """
+    try:
+        text = await _download_naver_page(stock_code)
+    except httpx.HTTPStatusError as e:
+        return {"annual": {}, "quarterly": {}, "fs_type": "CFS",
+                "error": f"HTTP {e.response.status_code}"}
+    except Exception as e:
+        return {"annual": {}, "quarterly": {}, "fs_type": "CFS", "error": str(e)}
+
+    return await asyncio.to_thread(_parse_naver_financial, text)
+
+
+# 3개월(분기 단독) 손익계산서 제외 조건
+_NOT_3M = or_(
+    FinancialStatement.sj_nm.is_(None),
+    not_(FinancialStatement.sj_nm.like("%3개월%")),
+)
+
+# 종목별 연간 매출 조회문 (bind 파라미터로 한 번만 생성해 재사용)
+_ANNUAL_REVENUE_STMT = (
+    select(
+        FinancialStatement.bsns_year,
+        FinancialStatement.fs_div,
+        FinancialStatement.thstrm_amount,
+    )
+    .where(and_(
+        FinancialStatement.stock_code == bindparam("stock_code"),
+        FinancialStatement.reprt_code == "11011",
+        FinancialStatement.account_nm.in_(REVENUE_NAMES),
+        FinancialStatement.sj_div.in_(["IS", "CIS"]),
+        _NOT_3M,
+    ))
+    .order_by(
+        FinancialStatement.bsns_year.desc(),
+        FinancialStatement.fs_div,
+        FinancialStatement.ord,
+    )
+)
+
+
+def _fold_revenue_rows(rows) -> dict:
+    """(bsns_year, fs_div, amount) 행을 연도별 매출로 정리 (CFS 우선)."""
+    result = {}
+    for year, fs_div, amount in rows:
+        if year not in result:
+            result[year] = {"revenue": amount, "fs_div": fs_div}
+        elif result[year]["fs_div"] == "OFS" and fs_div == "CFS":
+            result[year] = {"revenue": amount, "fs_div": fs_div}
+    return result
+
+
 async def get_db_annual_revenue(stock_code: str) -> dict:
     """DB에서 연간 매출액 + fs_div 조회.
 
     Returns:
         {bsns_year: {"revenue": int(원), "fs_div": "CFS"/"OFS"}}
     """
-    result = {}
     async with async_session_maker() as db:
-        stmt = (
-            select(
-                FinancialStatement.bsns_year,
-                FinancialStatement.fs_div,
-                FinancialStatement.thstrm_amount,
-                FinancialStatement.account_nm,
-                FinancialStatement.sj_nm,
-            )
-            .where(and_(
-                FinancialStatement.stock_code == stock_code,
-                FinancialStatement.reprt_code == "11011",
-                FinancialStatement.account_nm.in_(REVENUE_NAMES),
-                FinancialStatement.sj_div.in_(["IS", "CIS"]),
-            ))
-            .order_by(
-                FinancialStatement.bsns_year.desc(),
-                FinancialStatement.fs_div,
-                FinancialStatement.ord,
-            )
+        rows = (await db.execute(_ANNUAL_REVENUE_STMT, {"stock_code": stock_code})).all()
+
+    return _fold_revenue_rows(rows)
+
+
+async def get_db_annual_revenue_bulk(db, stock_codes: list[str]) -> dict[str, dict]:
+    """여러 종목의 연간 매출액을 한 번의 쿼리로 조회 (호출자 세션 사용).
+
+    Returns:
+        {stock_code: {bsns_year: {"revenue": int(원), "fs_div": "CFS"/"OFS"}}}
+    """
+    stmt = (
+        select(
+            FinancialStatement.stock_code,
+            FinancialStatement.bsns_year,
+            FinancialStatement.fs_div,
+            FinancialStatement.thstrm_amount,
         )
-        rows = (await db.execute(stmt)).all()
+        .where(and_(
+            FinancialStatement.stock_code.in_(stock_codes),
+            FinancialStatement.reprt_code == "11011",
+            FinancialStatement.account_nm.in_(REVENUE_NAMES),
+            FinancialStatement.sj_div.in_(["IS", "CIS"]),
+            _NOT_3M,
+        ))
+        .order_by(
+            FinancialStatement.stock_code,
+            FinancialStatement.bsns_year.desc(),
+            FinancialStatement.fs_div,
+            FinancialStatement.ord,
+        )
+    )
+    rows = (await db.execute(stmt)).all()
 
-        for year, fs_div, amount, acc_nm, sj_nm in rows:
-            if "3개월" in (sj_nm or ""):
-                continue
-            if year not in result:
-                result[year] = {"revenue": amount, "fs_div": fs_div}
-            elif result[year]["fs_div"] == "OFS" and fs_div == "CFS":
-                result[year] = {"revenue": amount, "fs_div": fs_div}
+    # fs_div(CFS/OFS)·연도는 행마다 반복되는 값이므로 intern하여 객체 공유
+    intern = sys.intern
+    rows_by_stock: dict[str, list] = {}
+    for sc, year, fs_div, amount in rows:
+        rows_by_stock.setdefault(sc, []).append((intern(year), intern(fs_div), amount))
 
-    return result
+    return {sc: _fold_revenue_rows(stock_rows) for sc, stock_rows in rows_by_stock.items()}
 
 
 async def get_settlement_month(stock_code: str) -> str:
@@ -244,8 +376,15 @@ def _match_years(naver_year_str: str, db_data: dict) -> tuple:
     return None, None
 
 
-async def cross_validate_stock(stock_code: str, verbose: bool = True) -> list[str]:
-    """단일 종목 네이버 교차 검증."""
+async def cross_validate_stock(
+    stock_code: str,
+    verbose: bool = True,
+    db_data: dict | None = None,
+) -> list[str]:
+    """단일 종목 네이버 교차 검증.
+
+    db_data를 넘기면 (get_db_annual_revenue_bulk 결과) DB 조회를 생략한다.
+    """
     issues = []
 
     naver = await fetch_naver_financial(stock_code)
@@ -254,7 +393,8 @@ async def cross_validate_stock(stock_code: str, verbose: bool = True) -> list[st
             print(f"  [{stock_code}] 네이버 오류: {naver['error']}")
         return [f"네이버 조회 실패: {naver['error']}"]
 
-    db_data = await get_db_annual_revenue(stock_code)
+    if db_data is None:
+        db_data = await get_db_annual_revenue(stock_code)
 
     if verbose:
         print(f"\n{'='*80}")
@@ -336,8 +476,12 @@ async def audit_all(limit: int = 0, threshold_pct: float = 20.0):
         result = await db.execute(stmt)
         stock_codes = sorted([r[0] for r in result.all()])
 
-    if limit > 0:
-        stock_codes = stock_codes[:limit]
+        if limit > 0:
+            stock_codes = stock_codes[:limit]
+
+        # DB 매출은 같은 세션에서 전체 종목을 한 번에 조회.
+        # 이후 종목별 검증은 이 결과만 사용하므로 세션을 다시 열지 않는다.
+        bulk_db_data = await get_db_annual_revenue_bulk(db, stock_codes)
 
     total = len(stock_codes)
     print(f"\n전체 {total}개 종목 네이버 교차 검증 시작...\n")
@@ -346,23 +490,37 @@ async def audit_all(limit: int = 0, threshold_pct: float = 20.0):
     error_count = 0
     all_issues = []
 
-    for i, sc in enumerate(stock_codes):
-        if (i + 1) % 20 == 0 or i == 0:
-            print(f"  진행: {i+1}/{total} ({(i+1)/total*100:.0f}%) ...")
+    # 세마포어로 동시 요청 수를 제한하며 HTTP 대기 시간을 겹치게 실행
+    sem = asyncio.Semaphore(AUDIT_CONCURRENCY)
 
-        try:
-            issues = await cross_validate_stock(sc, verbose=False)
-            if not issues:
-                ok_count += 1
-            elif any("조회 실패" in iss for iss in issues):
-                error_count += 1
-            else:
-                all_issues.append((sc, issues))
-        except Exception as e:
+    async def _one(sc: str) -> tuple[str, list[str] | None]:
+        async with sem:
+            try:
+                return sc, await cross_validate_stock(
+                    sc, verbose=False, db_data=bulk_db_data.get(sc, {}),
+                )
+            except Exception as e:
+                logger.debug(f"{sc} 오류: {e}")
+                return sc, None
+
+    # 끝나는 순서대로 집계하며 진행률 출력
+    tasks = [asyncio.create_task(_one(sc)) for sc in stock_codes]
+    for i, next_done in enumerate(asyncio.as_completed(tasks), 1):
+        sc, issues = await next_done
+
+        if issues is None:
             error_count += 1
-            logger.debug(f"{sc} 오류: {e}")
+        elif not issues:
+            ok_count += 1
+        elif any("조회 실패" in iss for iss in issues):
+            error_count += 1
+        else:
+            all_issues.append((sc, issues))
+
+        if i % 20 == 0 or i == total:
+            print(f"  진행: {i}/{total} ({i/total*100:.0f}%) ...")
 
-        await asyncio.sleep(0.3)  # Rate limit
+    all_issues.sort()
 
     mismatch_count = len(all_issues)
     print(f"\n{'='*80}")
@@ -460,17 +618,35 @@ async def main():
     parser.add_argument("--audit", action="store_true", help="전체 종목 검증")
     parser.add_argument("--limit", type=int, default=0, help="최대 종목 수")
     parser.add_argument("--recollect", help="CFS 재수집할 종목코드")
+    parser.add_argument("--refresh", action="store_true", help="당일 캐시를 무시하고 네이버에서 새로 조회")
     args = parser.parse_args()
 
-    if args.recollect:
-        await recollect_cfs(args.recollect)
-    elif args.audit:
-        await audit_all(limit=args.limit)
-    elif args.stock:
-        await cross_validate_stock(args.stock)
-    else:
-        await cross_validate_stock("950170")
+    global _refresh_cache
+    _refresh_cache = args.refresh
+
+    try:
+        if args.recollect:
+            await recollect_cfs(args.recollect)
+        elif args.audit:
+            await audit_all(limit=args.limit)
+        elif args.stock:
+            await cross_validate_stock(args.stock)
+        else:
+            await cross_validate_stock("950170")
+    finally:
+        await _close_client()
 
 
 if __name__ == "__main__":
+    # Windows 콘솔 UTF-8 출력 (스크립트 실행 시에만, import 시 표준출력을 바꾸지 않음)
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+    # uvloop이 있으면 사용 (uvicorn[standard] 의존성으로 설치됨, Windows 미지원)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     asyncio.run(main())
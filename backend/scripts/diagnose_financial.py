@@ -5,13 +5,35 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import select, and_, func, text
+from sqlalchemy import select, and_, func, text, bindparam, case
 from core.database import async_session_maker
 from models.financial_statement import FinancialStatement
 
 
 REVENUE_NAMES = ["매출액", "수익(매출액)", "영업수익", "매출"]
 
+REPRT_CODES = ["11011", "11012", "11013", "11014"]
+
+# 연도별 보고서(연간/반기/1분기/3분기) 매출액 행을 한 번에 조회.
+# 우선순위 정렬: CFS > OFS, 누적 > 3개월, ord 순. 루프마다 재구성하지 않도록 bind 파라미터로 한 번만 생성
+_REVENUE_STMT = (
+    select(FinancialStatement.reprt_code, FinancialStatement.thstrm_amount)
+    .where(and_(
+        FinancialStatement.stock_code == bindparam("stock_code"),
+        FinancialStatement.bsns_year == bindparam("year"),
+        FinancialStatement.reprt_code.in_(REPRT_CODES),
+        FinancialStatement.fs_div.in_(["CFS", "OFS"]),
+        FinancialStatement.sj_div.in_(["IS", "CIS"]),
+        FinancialStatement.account_nm.in_(REVENUE_NAMES),
+    ))
+    .order_by(
+        case((FinancialStatement.fs_div == "CFS", 0), else_=1),
+        case((FinancialStatement.sj_nm.like("%3개월%"), 1), else_=0),
+        FinancialStatement.ord,
+        FinancialStatement.id,
+    )
+)
+
 
 async def diagnose_stock(stock_code: str):
     """특정 종목의 DB 재무 원시 데이터 덤프."""
@@ -50,7 +72,8 @@ async def diagnose_stock(stock_code: str):
         print("매출액 관련 원시 데이터 (IS/CIS)")
         print(f"{'='*80}")
 
-        for rev_name in REVENUE_NAMES + ["영업수익", "수익"]:
+        # 계정명 패턴별로 조회 (중복 패턴 제외), 행을 스트리밍하며 바로 출력
+        for rev_name in dict.fromkeys(REVENUE_NAMES + ["영업수익", "수익"]):
             stmt2 = (
                 select(FinancialStatement)
                 .where(
@@ -64,20 +87,20 @@ async def diagnose_stock(stock_code: str):
                     FinancialStatement.fs_div,
                 )
             )
-            result2 = await db.execute(stmt2)
-            rows = result2.scalars().all()
-            if rows:
-                print(f"\n  --- 계정명 패턴: '{rev_name}' ---")
-                for r in rows:
-                    rc_name = {"11011": "연간", "11012": "반기", "11013": "Q1", "11014": "Q3"}.get(r.reprt_code, r.reprt_code)
-                    thstrm = f"{r.thstrm_amount:>20,}" if r.thstrm_amount is not None else f"{'None':>20}"
-                    frmtrm = f"{r.frmtrm_amount:>20,}" if r.frmtrm_amount is not None else f"{'None':>20}"
-                    print(
-                        f"  {r.bsns_year} {rc_name:>4}({r.reprt_code}) {r.fs_div}"
-                        f" | sj_nm={r.sj_nm!r:40s}"
-                        f" | 당기={thstrm} | 전기={frmtrm}"
-                        f" | account_nm={r.account_nm!r}"
-                    )
+            header_printed = False
+            async for r in await db.stream_scalars(stmt2):
+                if not header_printed:
+                    print(f"\n  --- 계정명 패턴: '{rev_name}' ---")
+                    header_printed = True
+                rc_name = {"11011": "연간", "11012": "반기", "11013": "Q1", "11014": "Q3"}.get(r.reprt_code, r.reprt_code)
+                thstrm = f"{r.thstrm_amount:>20,}" if r.thstrm_amount is not None else f"{'None':>20}"
+                frmtrm = f"{r.frmtrm_amount:>20,}" if r.frmtrm_amount is not None else f"{'None':>20}"
+                print(
+                    f"  {r.bsns_year} {rc_name:>4}({r.reprt_code}) {r.fs_div}"
+                    f" | sj_nm={r.sj_nm!r:40s}"
+                    f" | 당기={thstrm} | 전기={frmtrm}"
+                    f" | account_nm={r.account_nm!r}"
+                )
 
         # 3) 누적 vs 개별 판별 시뮬레이션
         print(f"\n{'='*80}")
@@ -89,11 +112,11 @@ async def diagnose_stock(stock_code: str):
             years_to_check.add(year)
 
         for year in sorted(years_to_check, reverse=True):
-            # 연간 매출
-            annual_rev = await _get_revenue(db, stock_code, year, "11011")
-            q3_rev = await _get_revenue(db, stock_code, year, "11014")
-            h1_rev = await _get_revenue(db, stock_code, year, "11012")
-            q1_rev = await _get_revenue(db, stock_code, year, "11013")
+            revs = await _get_revenue_all(db, stock_code, year)
+            annual_rev = revs.get("11011")
+            q3_rev = revs.get("11014")
+            h1_rev = revs.get("11012")
+            q1_rev = revs.get("11013")
 
             def fmt(v):
                 if v is None:
@@ -140,88 +163,118 @@ async def diagnose_stock(stock_code: str):
                     print(f"    [현재 버그] Q4 = Annual-Q1-H1-9M = {fmt(q4_bug)} ← 이중차감!")
 
 
-async def _get_revenue(db, stock_code, year, reprt_code):
-    """특정 기간의 매출액(thstrm_amount) 조회. CFS 우선, 3개월 제외."""
-    for fs_div in ["CFS", "OFS"]:
-        stmt = (
-            select(FinancialStatement.thstrm_amount, FinancialStatement.sj_nm)
-            .where(and_(
-                FinancialStatement.stock_code == stock_code,
-                FinancialStatement.bsns_year == year,
-                FinancialStatement.reprt_code == reprt_code,
-                FinancialStatement.fs_div == fs_div,
-                FinancialStatement.sj_div.in_(["IS", "CIS"]),
-                FinancialStatement.account_nm.in_(REVENUE_NAMES),
-            ))
-            .order_by(FinancialStatement.ord)
-        )
-        result = await db.execute(stmt)
-        rows = result.all()
-        # 3개월 제외, 누적 우선
-        for amount, sj_nm in rows:
-            if "3개월" not in (sj_nm or ""):
-                return amount
-        # 3개월만 있으면 그것이라도
-        if rows:
-            return rows[0][0]
-    return None
+async def _get_revenue_all(db, stock_code, year) -> dict[str, int]:
+    """연도의 보고서별 매출액(thstrm_amount) 조회. CFS 우선, 3개월 후순위.
+
+    Returns:
+        {reprt_code: amount}
+    """
+    result = await db.execute(_REVENUE_STMT, {"stock_code": stock_code, "year": year})
+    revs: dict[str, int] = {}
+    for reprt_code, amount in result.all():
+        if reprt_code not in revs:
+            revs[reprt_code] = amount
+    return revs
 
 
 async def audit_all_stocks():
     """전체 종목 매출 데이터 품질 검사."""
-    async with async_session_maker() as db:
-        # 재무 데이터가 있는 종목 목록
-        stmt = (
-            select(FinancialStatement.stock_code)
-            .group_by(FinancialStatement.stock_code)
-        )
-        result = await db.execute(stmt)
-        stock_codes = [r[0] for r in result.all()]
-
-        print(f"\n전체 {len(stock_codes)}개 종목 검사 시작...\n")
-
-        issues = []
-        for sc in stock_codes:
-            problems = await _check_stock_quality(db, sc)
-            if problems:
-                issues.append((sc, problems))
-
-        print(f"\n{'='*80}")
-        print(f"전수조사 결과: {len(stock_codes)}종목 중 {len(issues)}종목 이상 발견")
-        print(f"{'='*80}")
-        for sc, probs in issues:
-            for p in probs:
-                print(f"  {sc}: {p}")
-
-
-async def _check_stock_quality(db, stock_code) -> list[str]:
-    """종목별 데이터 품질 검사."""
-    problems = []
-
-    # 1) OFS만 있고 CFS가 없는 경우
-    stmt = (
+    # 1) 종목별 보고서 기간 × fs_div (전 종목 한 번에)
+    period_stmt = (
         select(
+            FinancialStatement.stock_code,
             FinancialStatement.bsns_year,
             FinancialStatement.reprt_code,
             FinancialStatement.fs_div,
         )
-        .where(FinancialStatement.stock_code == stock_code)
         .group_by(
+            FinancialStatement.stock_code,
             FinancialStatement.bsns_year,
             FinancialStatement.reprt_code,
             FinancialStatement.fs_div,
         )
     )
-    result = await db.execute(stmt)
-    rows = result.all()
 
-    fs_map = {}
-    for year, rc, fs_div in rows:
-        key = (year, rc)
-        if key not in fs_map:
-            fs_map[key] = set()
-        fs_map[key].add(fs_div)
+    # 2) 종목·연도·보고서별 대표 매출액 (CFS > OFS, 누적 > 3개월, ord 순 첫 행)
+    ranked = (
+        select(
+            FinancialStatement.stock_code,
+            FinancialStatement.bsns_year,
+            FinancialStatement.reprt_code,
+            FinancialStatement.thstrm_amount,
+            func.row_number().over(
+                partition_by=(
+                    FinancialStatement.stock_code,
+                    FinancialStatement.bsns_year,
+                    FinancialStatement.reprt_code,
+                ),
+                order_by=(
+                    case((FinancialStatement.fs_div == "CFS", 0), else_=1),
+                    case((FinancialStatement.sj_nm.like("%3개월%"), 1), else_=0),
+                    FinancialStatement.ord,
+                    FinancialStatement.id,
+                ),
+            ).label("rn"),
+        )
+        .where(and_(
+            FinancialStatement.reprt_code.in_(REPRT_CODES),
+            FinancialStatement.fs_div.in_(["CFS", "OFS"]),
+            FinancialStatement.sj_div.in_(["IS", "CIS"]),
+            FinancialStatement.account_nm.in_(REVENUE_NAMES),
+        ))
+        .subquery()
+    )
+    revenue_stmt = (
+        select(ranked.c.stock_code, ranked.c.bsns_year, ranked.c.reprt_code, ranked.c.thstrm_amount)
+        .where(ranked.c.rn == 1)
+    )
+
+    # 두 집계 쿼리는 서로 독립적이므로 별도 세션(커넥션)에서 동시에 실행
+    async def _fetch(stmt):
+        async with async_session_maker() as db:
+            return (await db.execute(stmt)).all()
+
+    period_rows, revenue_rows = await asyncio.gather(
+        _fetch(period_stmt), _fetch(revenue_stmt),
+    )
+
+    # 연도·보고서코드·fs_div는 행마다 반복되는 값이므로 intern하여 객체 공유
+    intern = sys.intern
+    fs_maps: dict[str, dict[tuple, set]] = {}
+    for sc, year, rc, fs_div in period_rows:
+        fs_maps.setdefault(sc, {}).setdefault((intern(year), intern(rc)), set()).add(intern(fs_div))
 
+    revenues: dict[str, dict[str, dict[str, int]]] = {}
+    for sc, year, rc, amount in revenue_rows:
+        revenues.setdefault(sc, {}).setdefault(intern(year), {})[intern(rc)] = amount
+
+    stock_codes = list(fs_maps)
+    print(f"\n전체 {len(stock_codes)}개 종목 검사 시작...\n")
+
+    issues = []
+    for sc in stock_codes:
+        problems = _check_stock_quality(fs_maps[sc], revenues.get(sc, {}))
+        if problems:
+            issues.append((sc, problems))
+
+    print(f"\n{'='*80}")
+    print(f"전수조사 결과: {len(stock_codes)}종목 중 {len(issues)}종목 이상 발견")
+    print(f"{'='*80}")
+    for sc, probs in issues:
+        for p in probs:
+            print(f"  {sc}: {p}")
+
+
+def _check_stock_quality(fs_map: dict[tuple, set], revenues: dict[str, dict[str, int]]) -> list[str]:
+    """종목별 데이터 품질 검사.
+
+    Args:
+        fs_map: {(bsns_year, reprt_code): {fs_div, ...}}
+        revenues: {bsns_year: {reprt_code: amount}}
+    """
+    problems = []
+
+    # 1) OFS만 있고 CFS가 없는 경우
     ofs_only_count = sum(1 for v in fs_map.values() if v == {"OFS"})
     if ofs_only_count > 0:
         problems.append(f"OFS만 존재 ({ofs_only_count}개 기간) - CFS 누락 가능성")
@@ -233,10 +286,11 @@ async def _check_stock_quality(db, stock_code) -> list[str]:
             years_with_annual.add(year)
 
     for year in sorted(years_with_annual, reverse=True)[:3]:
-        annual_rev = await _get_revenue(db, stock_code, year, "11011")
-        q1_rev = await _get_revenue(db, stock_code, year, "11013")
-        h1_rev = await _get_revenue(db, stock_code, year, "11012")
-        q3_rev = await _get_revenue(db, stock_code, year, "11014")
+        revs = revenues.get(year, {})
+        annual_rev = revs.get("11011")
+        q1_rev = revs.get("11013")
+        h1_rev = revs.get("11012")
+        q3_rev = revs.get("11014")
 
         if all(v is not None for v in [annual_rev, q1_rev, h1_rev, q3_rev]):
             # 올바른 분기합: Q1 + (H1-Q1) + (9M-H1) + (Annual-9M) = Annual (항상 일치)
@@ -270,4 +324,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop이 있으면 사용 (uvicorn[standard] 의존성으로 설치됨, Windows 미지원)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     asyncio.run(main())
@@ -7,20 +7,57 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy.dialects.postgresql import insert
+
 from core.database import SessionLocal, engine, Base
 from models.stock import Stock
+from utils.korean import extract_chosung
+
+UPSERT_CHUNK_SIZE = 1000
+
+
+def upsert_stocks(db_session, rows: dict[str, dict]):
+    """종목 행을 INSERT ... ON CONFLICT (code) DO UPDATE로 일괄 저장.
+
+    rows는 code 기준으로 중복 제거된 dict (같은 문장 안에서 동일 키를 두 번
+    갱신할 수 없으므로). Core insert는 @validates를 거치지 않으므로
+    name_chosung을 직접 채운다.
+    """
+    values = [
+        {**row, "name_chosung": extract_chosung(row["name"])}
+        for row in rows.values()
+    ]
+    for i in range(0, len(values), UPSERT_CHUNK_SIZE):
+        stmt = insert(Stock).values(values[i:i + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["code"],
+            set_={
+                "name": stmt.excluded.name,
+                "market": stmt.excluded.market,
+                "stock_type": stmt.excluded.stock_type,
+                "name_chosung": stmt.excluded.name_chosung,
+            },
+        )
+        db_session.execute(stmt)
 
 
 def load_stocks_csv(filepath: str, db_session):
     """종목 CSV 로드"""
     count = 0
+    rows: dict[str, dict] = {}
     with open(filepath, 'r', encoding='euc-kr') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader)
+        idx_code = header.index('단축코드')
+        idx_name = header.index('한글 종목약명')
+        idx_market = header.index('시장구분')
+        idx_type = header.index('주식종류') if '주식종류' in header else None
+
         for row in reader:
-            code = row['단축코드'].strip().strip('"')
-            name = row['한글 종목약명'].strip().strip('"')
-            market = row['시장구분'].strip().strip('"')
-            stock_type = row.get('주식종류', '').strip().strip('"')
+            code = row[idx_code].strip().strip('"')
+            name = row[idx_name].strip().strip('"')
+            market = row[idx_market].strip().strip('"')
+            stock_type = row[idx_type].strip().strip('"') if idx_type is not None else ''
 
             if not code or not name:
                 continue
@@ -29,45 +66,44 @@ def load_stocks_csv(filepath: str, db_session):
             if 'KOSDAQ' in market:
                 market = 'KOSDAQ'
 
-            stock = Stock(
-                code=code,
-                name=name,
-                market=market,
-                stock_type=stock_type or '보통주'
-            )
-            db_session.merge(stock)
+            rows[code] = {
+                "code": code,
+                "name": name,
+                "market": market,
+                "stock_type": stock_type or '보통주',
+            }
             count += 1
 
-            if count % 500 == 0:
-                print(f"  {count}개 처리 중...")
-
+    upsert_stocks(db_session, rows)
     return count
 
 
 def load_etf_csv(filepath: str, db_session):
     """ETF CSV 로드"""
     count = 0
+    rows: dict[str, dict] = {}
     with open(filepath, 'r', encoding='euc-kr') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader)
+        idx_code = header.index('단축코드')
+        idx_name = header.index('한글종목약명')
+
         for row in reader:
-            code = row['단축코드'].strip().strip('"')
-            name = row['한글종목약명'].strip().strip('"')
+            code = row[idx_code].strip().strip('"')
+            name = row[idx_name].strip().strip('"')
 
             if not code or not name:
                 continue
 
-            stock = Stock(
-                code=code,
-                name=name,
-                market='ETF',
-                stock_type='ETF'
-            )
-            db_session.merge(stock)
+            rows[code] = {
+                "code": code,
+                "name": name,
+                "market": 'ETF',
+                "stock_type": 'ETF',
+            }
             count += 1
 
-            if count % 500 == 0:
-                print(f"  {count}개 처리 중...")
-
+    upsert_stocks(db_session, rows)
     return count
 
 
@@ -17,30 +17,16 @@ async def migrate():
     """stock_investor_flows 테이블에 금액 컬럼 추가."""
 
     async with async_engine.begin() as conn:
-        # 컬럼 존재 여부 확인
-        check_sql = text("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = 'stock_investor_flows'
-            AND column_name = 'foreign_net_amount'
-        """)
-        result = await conn.execute(check_sql)
-        exists = result.fetchone()
-
-        if exists:
-            print("금액 컬럼이 이미 존재합니다.")
-            return
-
-        # 컬럼 추가
+        # IF NOT EXISTS → 존재 여부 조회 없이 재실행해도 안전
         alter_sql = text("""
             ALTER TABLE stock_investor_flows
-            ADD COLUMN foreign_net_amount BIGINT DEFAULT 0 NOT NULL,
-            ADD COLUMN institution_net_amount BIGINT DEFAULT 0 NOT NULL,
-            ADD COLUMN individual_net_amount BIGINT DEFAULT 0 NOT NULL
+            ADD COLUMN IF NOT EXISTS foreign_net_amount BIGINT DEFAULT 0 NOT NULL,
+            ADD COLUMN IF NOT EXISTS institution_net_amount BIGINT DEFAULT 0 NOT NULL,
+            ADD COLUMN IF NOT EXISTS individual_net_amount BIGINT DEFAULT 0 NOT NULL
         """)
 
         await conn.execute(alter_sql)
-        print("금액 컬럼 3개 추가 완료:")
+        print("금액 컬럼 3개 추가 완료 (이미 있던 컬럼은 유지):")
         print("  - foreign_net_amount (외국인 순매수금액)")
         print("  - institution_net_amount (기관 순매수금액)")
         print("  - individual_net_amount (개인 순매수금액)")
@@ -0,0 +1,43 @@
+"""분석 쿼리용 positions/trades 인덱스 마이그레이션 스크립트.
+
+create_all은 기존 테이블에 인덱스를 추가하지 않으므로 운영 DB에는 이 스크립트로 생성.
+
+실행:
+    cd /home/hyeon/project/my_stock/backend
+    python scripts/migrate_analysis_indexes.py
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from core.config import get_settings
+from core.database import create_indexes_concurrently
+
+settings = get_settings()
+engine = create_engine(settings.database_url)
+
+INDEXES = {
+    "ix_positions_exit_date_idea":
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_positions_exit_date_idea ON positions (exit_date, idea_id)",
+    "ix_positions_open_idea":
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_positions_open_idea ON positions (idea_id) WHERE exit_date IS NULL",
+    "ix_trades_type_date":
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trades_type_date ON trades (trade_type, trade_date)",
+}
+
+
+def run_migration():
+    """마이그레이션 실행."""
+    print("=== 분석 인덱스 마이그레이션 시작 ===")
+
+    print("\n1. positions/trades 인덱스 생성...")
+    create_indexes_concurrently(engine, INDEXES)
+    print("   - 인덱스 생성 완료")
+
+    print("\n=== 마이그레이션 완료 ===")
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import create_engine, text
 from core.config import get_settings
+from core.database import create_indexes_concurrently
 
 settings = get_settings()
 engine = create_engine(settings.database_url)
@@ -38,20 +39,8 @@ def run_migration():
         """))
         print("   - 테이블 생성 완료")
 
-        # 2. stock_investor_flows 인덱스 생성
-        print("\n2. stock_investor_flows 인덱스 생성...")
-        conn.execute(text("""
-            CREATE UNIQUE INDEX IF NOT EXISTS ix_stock_flow_code_date
-            ON stock_investor_flows (stock_code, flow_date)
-        """))
-        conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS ix_stock_flow_date
-            ON stock_investor_flows (flow_date)
-        """))
-        print("   - 인덱스 생성 완료")
-
-        # 3. theme_setups 테이블에 investor_flow_score 컬럼 추가
-        print("\n3. theme_setups 테이블에 investor_flow_score 컬럼 추가...")
+        # 2. theme_setups 테이블에 investor_flow_score 컬럼 추가
+        print("\n2. theme_setups 테이블에 investor_flow_score 컬럼 추가...")
         try:
             conn.execute(text("""
                 ALTER TABLE theme_setups
@@ -66,6 +55,17 @@ def run_migration():
 
         conn.commit()
 
+    # 3. stock_investor_flows 인덱스 생성
+    print("\n3. stock_investor_flows 인덱스 생성...")
+    create_indexes_concurrently(engine, {
+        "ix_stock_flow_code_date":
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_flow_code_date "
+            "ON stock_investor_flows (stock_code, flow_date)",
+        "ix_stock_flow_date":
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_flow_date ON stock_investor_flows (flow_date)",
+    })
+    print("   - 인덱스 생성 완료")
+
     print("\n=== 마이그레이션 완료 ===")
 
 
@@ -19,107 +19,94 @@ import io
 import uuid
 import re
 import logging
-from datetime import date as date_cls, datetime, timedelta
+from datetime import datetime
 from decimal import Decimal
 from collections import defaultdict
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
 
 # backend 디렉토리를 path에 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from sqlalchemy import text
+import pandas as pd
+from pandas.tseries.offsets import BDay
+from sqlalchemy import delete, func, insert, select, text
 from core.database import SessionLocal
-from models import Stock, InvestmentIdea, IdeaStatus, Position
+from models import Stock, InvestmentIdea, IdeaStatus, Position, TrackingSnapshot
 from models.trade import Trade, TradeType
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 DEFAULT_CSV = r'C:\Users\whdqj\Downloads\삼증_매매내역.csv'
+INSERT_PAGE_SIZE = 10000  # executemany INSERT 시 한 번에 묶을 행 수
+CSV_CHUNK_ROWS = 5000     # read_csv 청크 크기
 
 
-def _settlement_to_trade_date(settlement: date_cls) -> date_cls:
-    """결제일 → 체결일 변환 (영업일 2일 전으로 되돌림).
+_TICKER_CODE_RE = re.compile(r'\(([A-Za-z0-9]{6})\)')  # '가온칩스(399720)' → '399720'
+
+CSV_COLUMNS = ['date', 'type_raw', 'stock_name', 'qty', 'price', 'amount', 'fee', 'tax']
+TRADE_FIELDS = ['date', 'type_raw', 'is_buy', 'stock_name', 'qty', 'price', 'amount', 'fee', 'tax']
 
-    한국 주식시장 T+2 결제: 체결일 + 영업일 2일 = 결제일
-    따라서 결제일에서 영업일 2일을 빼면 체결일.
-    (공휴일은 미반영, 주말만 스킵)
-    """
-    d = settlement
-    bdays = 0
-    while bdays < 2:
-        d -= timedelta(days=1)
-        if d.weekday() < 5:  # 월~금
-            bdays += 1
-    return d
-
-
-def parse_csv(csv_path: str) -> list[dict]:
-    """삼성증권 CSV 파싱."""
-    with open(csv_path, 'rb') as f:
-        raw = f.read()
-
-    text_content = raw.decode('cp949', errors='replace')
-    lines = text_content.strip().split('\n')
-
-    data_lines = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        # 메타데이터/헤더 스킵
-        if line.startswith(('계좌', '[', '조회', '거래일자,거래명')):
-            continue
-        # 페이지 번호 스킵 (예: 1/42)
-        if re.match(r'^\d+/\d+$', line):
-            continue
-        data_lines.append(line)
 
-    reader = csv.reader(io.StringIO('\n'.join(data_lines)))
-    trades = []
-    for row in reader:
-        if len(row) < 6:
+def parse_csv(csv_path: str) -> Iterator[dict]:
+    """삼성증권 CSV 파싱 (거래 dict를 CSV 순서대로 yield).
+
+    파일 전체를 메모리에 올리지 않고 read_csv가 청크 단위로 스트리밍 파싱.
+    메타데이터/헤더/페이지 번호(예: 1/42) 행은 거래일자 형식으로 걸러냄.
+    빈 수량/단가/금액/수수료/세금 칸은 0으로 처리.
+    날짜순 정렬은 종목별로 _build_positions_from_trades에서 수행.
+    """
+    reader = pd.read_csv(
+        csv_path,
+        encoding='cp949',
+        encoding_errors='replace',
+        header=None,
+        names=CSV_COLUMNS,
+        usecols=range(len(CSV_COLUMNS)),
+        dtype=str,
+        skipinitialspace=True,
+        on_bad_lines='skip',
+        chunksize=CSV_CHUNK_ROWS,
+    )
+    for df in reader:
+        df = df[df['date'].str.strip().str.fullmatch(r'\d{4}-\d{2}-\d{2}', na=False)]
+        if df.empty:
             continue
 
-        date_str, trade_type, stock_name = row[0].strip(), row[1].strip(), row[2].strip()
-        qty = int(row[3].replace(',', '').strip()) if row[3].strip() else 0
-        price = int(row[4].replace(',', '').replace('"', '').strip()) if row[4].strip() else 0
-        amount = int(row[5].replace(',', '').replace('"', '').strip()) if row[5].strip() else 0
-        fee = int(row[6].replace(',', '').replace('"', '').strip()) if len(row) > 6 and row[6].strip() else 0
-        tax = int(row[7].replace(',', '').replace('"', '').strip()) if len(row) > 7 and row[7].strip() else 0
+        for col in ('date', 'type_raw', 'stock_name'):
+            df[col] = df[col].fillna('').str.strip()
+        for col in ('qty', 'price', 'amount', 'fee', 'tax'):
+            num = pd.to_numeric(df[col].str.replace(',', '', regex=False).str.strip(), errors='coerce')
+            df[col] = num.fillna(0).astype('int64')
 
         # 매수_NXT / 매도_NXT → 매수 / 매도 (D+2 결제 정상 처리)
-        is_buy = '매수' in trade_type
+        df['is_buy'] = df['type_raw'].str.contains('매수', regex=False)
 
         # CSV 날짜는 결제일 → 영업일 2일 전(체결일)으로 보정
-        settlement_date = date_cls.fromisoformat(date_str)
-        trade_date = _settlement_to_trade_date(settlement_date)
-
-        trades.append({
-            'date': trade_date,
-            'type_raw': trade_type,
-            'is_buy': is_buy,
-            'stock_name': stock_name,
-            'qty': qty,
-            'price': price,
-            'amount': amount,
-            'fee': fee,
-            'tax': tax,
-        })
-
-    # 날짜 오름차순 (오래된 것부터)
-    trades.sort(key=lambda t: (t['date'], 0 if t['is_buy'] else 1))
-    return trades
+        # 한국 주식시장 T+2 결제 (공휴일은 미반영, 주말만 스킵)
+        df['date'] = (pd.to_datetime(df['date'], format='%Y-%m-%d') - BDay(2)).dt.date
+
+        yield from df[TRADE_FIELDS].to_dict('records')
+
+
+def _load_stock_name_map() -> dict[str, str]:
+    """별도 스레드용: 자체 세션으로 종목명 맵 조회 (Session은 스레드 간 공유 불가)."""
+    db = SessionLocal()
+    try:
+        return build_stock_name_map(db)
+    finally:
+        db.close()
 
 
 def build_stock_name_map(db) -> dict[str, str]:
     """Stock 테이블에서 종목명 → 종목코드 매핑."""
-    stocks = db.query(Stock).all()
-    name_map = {}
-    for s in stocks:
-        name_map[s.name] = s.code
-        # 공백 제거 버전도
-        name_map[s.name.replace(' ', '')] = s.code
+    rows = db.execute(select(Stock.name, Stock.code)).all()
+    # 공백 제거 + 소문자 버전 (원본 키와 겹치면 원본 우선)
+    name_map = {name.replace(' ', '').lower(): code for name, code in rows}
+    # 공백 제거 버전도
+    name_map.update({name.replace(' ', ''): code for name, code in rows})
+    name_map.update({name: code for name, code in rows})
     return name_map
 
 
@@ -131,18 +118,10 @@ MANUAL_NAME_MAP = {
 
 
 def resolve_stock_code(stock_name: str, name_map: dict) -> Optional[str]:
-    """종목명으로 종목코드 찾기."""
-    # 수동 매핑 우선
-    if stock_name in MANUAL_NAME_MAP:
-        return MANUAL_NAME_MAP[stock_name]
-    # 직접 매핑
-    if stock_name in name_map:
-        return name_map[stock_name]
-    # 공백 제거
+    """종목명으로 종목코드 찾기 (수동 매핑 → 원본 → 공백 제거/소문자)."""
     cleaned = stock_name.replace(' ', '')
-    if cleaned in name_map:
-        return name_map[cleaned]
-    return None
+    return (MANUAL_NAME_MAP.get(stock_name) or name_map.get(stock_name)
+            or name_map.get(cleaned) or name_map.get(cleaned.lower()))
 
 
 def migrate(csv_path: str, dry_run: bool = False):
@@ -151,25 +130,33 @@ def migrate(csv_path: str, dry_run: bool = False):
     logger.info("삼성증권 매매내역 CSV 마이그레이션")
     logger.info("=" * 60)
 
-    # 1. CSV 파싱
-    logger.info(f"\n[1/5] CSV 파싱: {csv_path}")
-    csv_trades = parse_csv(csv_path)
-    logger.info(f"  총 {len(csv_trades)}건 파싱 완료")
-    logger.info(f"  기간: {csv_trades[0]['date']} ~ {csv_trades[-1]['date']}")
-
-    # 종목별 그룹
-    stock_trades = defaultdict(list)
-    for t in csv_trades:
-        stock_trades[t['stock_name']].append(t)
-
-    logger.info(f"  종목 수: {len(stock_trades)}")
-
     db = SessionLocal()
     try:
+        # 1. CSV 파싱 (종목명 맵 DB 조회는 별도 스레드에서 동시에 진행)
+        logger.info(f"\n[1/5] CSV 파싱: {csv_path}")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            name_map_future = executor.submit(_load_stock_name_map)
+
+            # 종목별 그룹 (파싱과 동시에 적재 → 전체 거래 리스트를 따로 두지 않음)
+            stock_trades = defaultdict(list)
+            total = 0
+            first_date = last_date = None
+            for t in parse_csv(csv_path):
+                stock_trades[t['stock_name']].append(t)
+                total += 1
+                if first_date is None or t['date'] < first_date:
+                    first_date = t['date']
+                if last_date is None or t['date'] > last_date:
+                    last_date = t['date']
+
+            name_map = name_map_future.result()
+
+        logger.info(f"  총 {total}건 파싱 완료")
+        logger.info(f"  기간: {first_date} ~ {last_date}")
+        logger.info(f"  종목 수: {len(stock_trades)}")
+
         # 2. 종목코드 매핑
         logger.info("\n[2/5] 종목코드 매핑")
-        name_map = build_stock_name_map(db)
-
         mapped = {}
         unmapped = []
         for name in stock_trades.keys():
@@ -190,22 +177,38 @@ def migrate(csv_path: str, dry_run: bool = False):
 
         # 3. 기존 데이터 삭제
         logger.info("\n[3/5] 기존 데이터 삭제")
-        existing_trades = db.query(Trade).count()
-        existing_positions = db.query(Position).count()
+        # 두 테이블 건수를 한 번의 왕복으로 조회
+        existing = db.execute(text(
+            "SELECT (SELECT count(*) FROM trades) AS trades, (SELECT count(*) FROM positions) AS positions"
+        )).one()
+        existing_trades, existing_positions = existing.trades, existing.positions
         # CSV 임포트로 자동 생성된 아이디어 (thesis에 'CSV 임포트' 포함)
-        csv_ideas = db.query(InvestmentIdea).filter(
-            InvestmentIdea.thesis.like('%CSV 임포트%')
-        ).all()
+        csv_idea_filter = InvestmentIdea.thesis.like('%CSV 임포트%')
+        csv_idea_count = db.scalar(
+            select(func.count()).select_from(InvestmentIdea).where(csv_idea_filter)
+        )
         logger.info(f"  기존 Trade: {existing_trades}건")
         logger.info(f"  기존 Position: {existing_positions}건")
-        logger.info(f"  CSV 임포트 Idea: {len(csv_ideas)}건 (삭제 대상)")
+        logger.info(f"  CSV 임포트 Idea: {csv_idea_count}건 (삭제 대상)")
 
         if not dry_run:
-            db.query(Trade).delete()
-            db.query(Position).delete()
+            if db.bind.dialect.name == 'postgresql':
+                # trades → positions 외 참조 테이블 없음 → CASCADE 불필요
+                db.execute(text("TRUNCATE TABLE trades, positions"))
+            else:
+                db.execute(delete(Trade))
+                db.execute(delete(Position))
             # CSV 임포트로 생성된 아이디어만 삭제 (수동 생성 아이디어 보존)
-            for idea in csv_ideas:
-                db.delete(idea)
+            # ORM cascade 대신 스냅샷 → 아이디어 순으로 직접 삭제
+            csv_idea_ids = select(InvestmentIdea.id).where(csv_idea_filter)
+            db.execute(
+                delete(TrackingSnapshot).where(TrackingSnapshot.idea_id.in_(csv_idea_ids)),
+                execution_options={'synchronize_session': False},
+            )
+            db.execute(
+                delete(InvestmentIdea).where(csv_idea_filter),
+                execution_options={'synchronize_session': False},
+            )
             db.commit()
             logger.info("  삭제 완료")
 
@@ -216,6 +219,10 @@ def migrate(csv_path: str, dry_run: bool = False):
         created_positions = 0
         created_trades = 0
         skipped_stocks = []
+        position_rows = []
+        trade_rows = []
+        idea_index = {} if dry_run else _build_idea_index(db)
+        new_idea_ids: set[uuid.UUID] = set()
 
         for stock_name, trades in sorted(stock_trades.items()):
             stock_code = mapped.get(stock_name)
@@ -226,62 +233,65 @@ def migrate(csv_path: str, dry_run: bool = False):
             # 순 포지션 계산 (매수/매도 히스토리 추적)
             positions_data = _build_positions_from_trades(stock_name, stock_code, trades)
 
-            for pos_data in positions_data:
-                if dry_run:
-                    created_positions += 1
-                    created_trades += len(pos_data['trades'])
-                    if pos_data['is_open']:
-                        created_ideas += 1
-                    continue
-
-                # 오픈/클로즈 모두에 대해 Idea 찾거나 생성
-                idea = _find_or_create_idea(db, stock_code, stock_name, pos_data)
-                if idea and idea.id not in [i.id for i in db.new]:
-                    created_ideas += 0  # 기존 아이디어
-                else:
-                    created_ideas += 1
+            if dry_run:
+                created_positions += len(positions_data)
+                created_trades += sum(len(pos_data['trades']) for pos_data in positions_data)
+                created_ideas += sum(1 for pos_data in positions_data if pos_data['is_open'])
+                continue
+
+            # 오픈/클로즈 모두 같은 종목 Idea에 연결 → 종목당 1회만 찾거나 생성
+            idea = _find_or_create_idea(
+                db, stock_code, stock_name, positions_data[0], idea_index, new_idea_ids,
+            )
 
+            for pos_data in positions_data:
                 # open 포지션이면 아이디어 status를 active로 갱신
                 if pos_data['is_open'] and idea.status != IdeaStatus.ACTIVE:
                     idea.status = IdeaStatus.ACTIVE
 
-                # Position 생성
-                position = Position(
-                    id=uuid.uuid4(),
-                    idea_id=idea.id,
-                    ticker=stock_code,
-                    entry_price=pos_data['entry_price'],
-                    entry_date=pos_data['entry_date'],
-                    quantity=pos_data['current_qty'],
-                    exit_price=pos_data.get('exit_price'),
-                    exit_date=pos_data.get('exit_date'),
-                    exit_reason=pos_data.get('exit_reason'),
-                    notes=pos_data.get('notes'),
-                )
-                db.add(position)
-                db.flush()
+                # Position 행 (id 선할당 → Trade FK를 flush 없이 연결)
+                position_id = uuid.uuid4()
+                position_rows.append({
+                    'id': position_id,
+                    'idea_id': idea.id,
+                    'ticker': stock_code,
+                    'entry_price': pos_data['entry_price'],
+                    'entry_date': pos_data['entry_date'],
+                    'quantity': pos_data['current_qty'],
+                    'exit_price': pos_data.get('exit_price'),
+                    'exit_date': pos_data.get('exit_date'),
+                    'exit_reason': pos_data.get('exit_reason'),
+                    'notes': pos_data.get('notes'),
+                })
                 created_positions += 1
 
-                # Trade 레코드 생성
+                # Trade 행
                 for td in pos_data['trades']:
-                    trade = Trade(
-                        id=uuid.uuid4(),
-                        position_id=position.id,
-                        trade_type=td['trade_type'],
-                        trade_date=td['date'],
-                        price=td['price'],
-                        quantity=td['qty'],
-                        realized_profit=td.get('realized_profit'),
-                        realized_return_pct=td.get('realized_return_pct'),
-                        avg_price_after=td.get('avg_price_after'),
-                        quantity_after=td.get('quantity_after'),
-                        stock_code=stock_code,
-                        stock_name=stock_name,
-                    )
-                    db.add(trade)
+                    trade_rows.append({
+                        'id': uuid.uuid4(),
+                        'position_id': position_id,
+                        'trade_type': td['trade_type'],
+                        'trade_date': td['date'],
+                        'price': td['price'],
+                        'quantity': td['qty'],
+                        'realized_profit': td.get('realized_profit'),
+                        'realized_return_pct': td.get('realized_return_pct'),
+                        'avg_price_after': td.get('avg_price_after'),
+                        'quantity_after': td.get('quantity_after'),
+                        'stock_code': stock_code,
+                        'stock_name': stock_name,
+                    })
                     created_trades += 1
 
         if not dry_run:
+            created_ideas = len(new_idea_ids)
+            # dict 행을 ORM 매퍼 없이 테이블에 바로 적재 (insertmanyvalues: 페이지당 1회 multi-row INSERT)
+            if position_rows:
+                db.execute(
+                    insert(Position.__table__).execution_options(insertmanyvalues_page_size=INSERT_PAGE_SIZE),
+                    position_rows,
+                )
+            _insert_trades(db, trade_rows)
             db.commit()
 
         logger.info(f"\n  생성 결과:")
@@ -308,53 +318,105 @@ def migrate(csv_path: str, dry_run: bool = False):
         db.close()
 
 
+TRADE_COPY_COLUMNS = (
+    'id', 'position_id', 'trade_type', 'trade_date', 'price', 'quantity',
+    'realized_profit', 'realized_return_pct', 'avg_price_after', 'quantity_after',
+    'stock_code', 'stock_name', 'created_at',
+)
+
+
+def _insert_trades(db, trade_rows: list[dict]):
+    """Trade 행 일괄 적재. PostgreSQL은 COPY, 그 외 dialect는 executemany INSERT."""
+    if not trade_rows:
+        return
+    if db.bind.dialect.name != 'postgresql':
+        db.execute(
+            insert(Trade.__table__).execution_options(insertmanyvalues_page_size=INSERT_PAGE_SIZE),
+            trade_rows,
+        )
+        return
+
+    now = datetime.utcnow()
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter='\t', lineterminator='\n')
+    for row in trade_rows:
+        row = {**row, 'trade_type': row['trade_type'].value, 'created_at': now}
+        writer.writerow(['\\N' if row.get(c) is None else row[c] for c in TRADE_COPY_COLUMNS])
+    buf.seek(0)
+
+    cur = db.connection().connection.cursor()
+    try:
+        cur.copy_expert(
+            f"COPY trades ({', '.join(TRADE_COPY_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')",
+            buf,
+        )
+    finally:
+        cur.close()
+
+
+def _round_div(n: int, d: int) -> int:
+    """정수 나눗셈 후 반올림 (Decimal 기본값과 같은 ROUND_HALF_EVEN)."""
+    q, r = divmod(n, d)
+    if 2 * r > d or (2 * r == d and q % 2):
+        q += 1
+    return q
+
+
 def _build_positions_from_trades(stock_name: str, stock_code: str, trades: list[dict]) -> list[dict]:
     """한 종목의 거래 리스트에서 Position 데이터 구축.
 
     매수/매도를 순차 처리하며, 전량 매도 시 Position을 닫고 새 Position 시작.
+    평단가는 정수(원 × 100) 단위로 누적 계산하고, 저장 시점에만 Decimal로 변환.
     """
     positions = []
     current_pos = None
+    entry_cents = 0  # 현재 포지션 평단가 (원 × 100)
 
-    for t in trades:
+    # 날짜 오름차순 (오래된 것부터), 같은 날은 매수 먼저
+    for t in sorted(trades, key=lambda t: (t['date'], not t['is_buy'])):
+        price = Decimal(t['price'])  # int → Decimal 직접 변환 (str 경유 불필요)
         if t['is_buy']:
             if current_pos is None:
                 # 새 포지션 시작
+                entry_cents = t['price'] * 100
                 current_pos = {
-                    'entry_price': Decimal(str(t['price'])),
+                    'entry_price': price,
                     'entry_date': t['date'],
                     'current_qty': t['qty'],
                     'total_buy_qty': t['qty'],
-                    'total_buy_amount': Decimal(str(t['amount'])),
+                    'total_buy_amount': t['amount'],
                     'is_open': True,
                     'trades': [{
                         'trade_type': TradeType.BUY,
                         'date': t['date'],
-                        'price': Decimal(str(t['price'])),
+                        'price': price,
                         'qty': t['qty'],
-                        'avg_price_after': Decimal(str(t['price'])),
+                        'avg_price_after': price,
                         'quantity_after': t['qty'],
                     }],
                     'notes': None,
                 }
             else:
                 # 추가매수
-                old_total = current_pos['entry_price'] * current_pos['current_qty']
-                new_total = Decimal(str(t['price'])) * t['qty']
                 new_qty = current_pos['current_qty'] + t['qty']
-                new_avg = (old_total + new_total) / new_qty
+                entry_cents = _round_div(
+                    entry_cents * current_pos['current_qty'] + t['price'] * 100 * t['qty'],
+                    new_qty,
+                )
+                new_avg = Decimal(entry_cents).scaleb(-2)
 
                 current_pos['current_qty'] = new_qty
                 current_pos['total_buy_qty'] += t['qty']
-                current_pos['total_buy_amount'] += Decimal(str(t['amount']))
-                current_pos['entry_price'] = round(new_avg, 2)
+                current_pos['total_buy_amount'] += t['amount']
+                current_pos['entry_price'] = new_avg
 
                 current_pos['trades'].append({
                     'trade_type': TradeType.ADD_BUY,
                     'date': t['date'],
-                    'price': Decimal(str(t['price'])),
+                    'price': price,
                     'qty': t['qty'],
-                    'avg_price_after': round(new_avg, 2),
+                    'avg_price_after': new_avg,
                     'quantity_after': new_qty,
                 })
         else:
@@ -364,10 +426,10 @@ def _build_positions_from_trades(stock_name: str, stock_code: str, trades: list[
                 # → 별도 Position으로 처리 (exit만 있는 상태)
                 realized_profit = None  # 매입가 모르므로 계산 불가
                 positions.append({
-                    'entry_price': Decimal(str(t['price'])),  # 매도가를 대체로 사용
+                    'entry_price': price,  # 매도가를 대체로 사용
                     'entry_date': t['date'],
                     'current_qty': 0,
-                    'exit_price': Decimal(str(t['price'])),
+                    'exit_price': price,
                     'exit_date': t['date'],
                     'exit_reason': 'CSV범위외매수',
                     'is_open': False,
@@ -375,7 +437,7 @@ def _build_positions_from_trades(stock_name: str, stock_code: str, trades: list[
                     'trades': [{
                         'trade_type': TradeType.SELL,
                         'date': t['date'],
-                        'price': Decimal(str(t['price'])),
+                        'price': price,
                         'qty': t['qty'],
                         'quantity_after': 0,
                     }],
@@ -383,12 +445,12 @@ def _build_positions_from_trades(stock_name: str, stock_code: str, trades: list[
                 continue
 
             sell_qty = t['qty']
-            sell_price = Decimal(str(t['price']))
 
-            # 실현손익 계산
+            # 실현손익 계산 (원 × 100 정수 기준)
             entry_price = current_pos['entry_price']
-            realized_profit = float(sell_price - entry_price) * sell_qty
-            realized_pct = float((sell_price - entry_price) / entry_price * 100) if entry_price > 0 else 0
+            diff_cents = t['price'] * 100 - entry_cents
+            realized_profit = diff_cents * sell_qty / 100
+            realized_pct = diff_cents * 100 / entry_cents if entry_cents > 0 else 0
 
             remaining = current_pos['current_qty'] - sell_qty
 
@@ -397,14 +459,14 @@ def _build_positions_from_trades(stock_name: str, stock_code: str, trades: list[
                 current_pos['trades'].append({
                     'trade_type': TradeType.SELL,
                     'date': t['date'],
-                    'price': sell_price,
+                    'price': price,
                     'qty': sell_qty,
                     'realized_profit': round(realized_profit, 2),
                     'realized_return_pct': round(realized_pct, 2),
                     'avg_price_after': None,
                     'quantity_after': 0,
                 })
-                current_pos['exit_price'] = sell_price
+                current_pos['exit_price'] = price
                 current_pos['exit_date'] = t['date']
                 current_pos['exit_reason'] = None
                 current_pos['is_open'] = False
@@ -417,7 +479,7 @@ def _build_positions_from_trades(stock_name: str, stock_code: str, trades: list[
                 current_pos['trades'].append({
                     'trade_type': TradeType.PARTIAL_SELL,
                     'date': t['date'],
-                    'price': sell_price,
+                    'price': price,
                     'qty': sell_qty,
                     'realized_profit': round(realized_profit, 2),
                     'realized_return_pct': round(realized_pct, 2),
@@ -432,20 +494,29 @@ def _build_positions_from_trades(stock_name: str, stock_code: str, trades: list[
     return positions
 
 
-def _find_or_create_idea(db, stock_code: str, stock_name: str, pos_data: dict) -> InvestmentIdea:
-    """종목에 맞는 Idea 찾거나 생성.
+def _build_idea_index(db) -> dict[str, InvestmentIdea]:
+    """종목코드 → Idea 인덱스 (마이그레이션 시작 시 1회 구축).
 
     기존 아이디어의 tickers 형식: ['종목명(코드)'] 또는 ['코드']
-    둘 다 매칭하도록 코드 추출 후 비교.
+    둘 다 매칭하도록 코드 추출 후 키로 사용.
     """
-    existing_ideas = db.query(InvestmentIdea).all()
-    for idea in existing_ideas:
+    idea_index = {}
+    for idea in db.execute(select(InvestmentIdea)).scalars():
         for ticker in (idea.tickers or []):
             # '가온칩스(399720)' → '399720' 또는 '399720' 그대로
-            match = re.search(r'\(([A-Za-z0-9]{6})\)', ticker)
-            extracted = match.group(1) if match else ticker
-            if extracted == stock_code:
-                return idea
+            match = _TICKER_CODE_RE.search(ticker)
+            code = match.group(1) if match else ticker
+            idea_index.setdefault(code, idea)
+    return idea_index
+
+
+def _find_or_create_idea(db, stock_code: str, stock_name: str, pos_data: dict,
+                         idea_index: dict[str, InvestmentIdea],
+                         new_idea_ids: set[uuid.UUID]) -> InvestmentIdea:
+    """종목에 맞는 Idea 찾거나 생성 (생성 시 idea_index, new_idea_ids에 등록)."""
+    idea = idea_index.get(stock_code)
+    if idea is not None:
+        return idea
 
     # 없으면 새로 생성 (이름(코드) 형식)
     ticker_label = f'{stock_name}({stock_code})'
@@ -461,6 +532,8 @@ def _find_or_create_idea(db, stock_code: str, stock_name: str, pos_data: dict) -
     )
     db.add(idea)
     db.flush()
+    idea_index[stock_code] = idea
+    new_idea_ids.add(idea.id)
     return idea
 
 
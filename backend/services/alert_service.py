@@ -1,12 +1,18 @@
 """알림 서비스 - 규칙 엔진 및 발송 처리."""
+import asyncio
+import functools
+import json
 import logging
+import time
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Awaitable, Callable, Sequence
 from uuid import UUID
 
-from core.timezone import now_kst, today_kst
+from core.timezone import now_kst
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, case, and_, or_, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.alert import AlertRule, NotificationLog, AlertType, NotificationChannel
@@ -19,18 +25,109 @@ from models.expert_mention import ExpertMention
 from integrations.telegram.client import get_telegram_client
 from integrations.email.client import get_email_client
 from core.config import get_settings
+from core.database import async_session_maker
 
 logger = logging.getLogger(__name__)
 
+BOT_INFO_TTL_SECONDS = 3600  # 텔레그램 봇 정보(getMe) 캐시 유지 시간
+STREAM_YIELD_PER = 500  # 알림 체크 조회 시 서버 커서에서 한 번에 가져올 행 수
+
+
+def _fomo_score_sql():
+    """FOMO 점수 SQL 식 (_calculate_fomo_score와 동일 기준).
+
+    InvestmentIdea에 목표가/진입가/확신도 컬럼이 없어 기대 수익률은 target_return_pct로 대체,
+    확신도 항목(25점)은 제외. 최대 50점.
+    """
+    thesis_len = func.coalesce(func.char_length(InvestmentIdea.thesis), 0)
+    return_score = case(
+        (InvestmentIdea.target_return_pct > 50, 30),
+        (InvestmentIdea.target_return_pct > 30, 15),
+        else_=0,
+    )
+    thesis_score = case((and_(thesis_len > 0, thesis_len < 50), 20), else_=0)
+    return func.least(return_score + thesis_score, 100)
+
+
+# ============ Rule Conditions ============
+# 규칙 conditions(JSON)를 규칙 컴파일 시 한 번 파싱해 두는 설정 구조체
+
+@dataclass(slots=True, frozen=True)
+class RuleConditions:
+    """조건 값이 없는 규칙용 기본 설정."""
+
+    @classmethod
+    def from_conditions(cls, conditions: Optional[dict]) -> "RuleConditions":
+        """conditions에서 필드에 해당하는 값만 취하고 나머지는 기본값 사용."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (conditions or {}).items() if k in names})
+
+
+@dataclass(slots=True, frozen=True)
+class YouTubeSurgeConditions(RuleConditions):
+    threshold: int = 5  # 언급 급증 기준
+    time_window_hours: int = 24
+
+
+@dataclass(slots=True, frozen=True)
+class DisclosureConditions(RuleConditions):
+    time_window_hours: int = 24
+    stock_codes: Sequence[str] = ()
+
+
+@dataclass(slots=True, frozen=True)
+class FomoWarningConditions(RuleConditions):
+    fomo_score_threshold: int = 50  # 최대 50점: 목표 수익률 50% 초과 + 짧은 근거일 때 발생
+
+
+@dataclass(slots=True, frozen=True)
+class ExpertNewMentionConditions(RuleConditions):
+    time_window_hours: int = 24
+    min_mentions: int = 2  # 최소 언급 횟수
+
+
+@dataclass(slots=True, frozen=True)
+class ExpertCrossCheckConditions(RuleConditions):
+    time_window_hours: int = 24
+
+
+async def _no_alerts(service: "AlertService", now: datetime) -> List[dict]:
+    """평가 대상이 아닌 규칙용 평가 함수."""
+    return []
+
 
 class AlertService:
     """알림 서비스."""
 
+    # 알림 유형 → (평가 메서드, 조건 설정 타입)
+    _RULE_CHECKS = {
+        AlertType.YOUTUBE_SURGE: ("_check_youtube_surge", YouTubeSurgeConditions),
+        AlertType.DISCLOSURE_IMPORTANT: ("_check_important_disclosures", DisclosureConditions),
+        AlertType.FOMO_WARNING: ("_check_fomo_warning", FomoWarningConditions),
+        AlertType.TARGET_REACHED: ("_check_target_reached", RuleConditions),
+        AlertType.TIME_EXPIRED: ("_check_time_expired", RuleConditions),
+        AlertType.EXPERT_NEW_MENTION: ("_check_expert_new_mentions", ExpertNewMentionConditions),
+        AlertType.EXPERT_CROSS_CHECK: ("_check_expert_cross_check", ExpertCrossCheckConditions),
+    }
+    _EXPERT_ALERT_TYPES = frozenset({AlertType.EXPERT_NEW_MENTION, AlertType.EXPERT_CROSS_CHECK})
+
+    # 텔레그램 봇 정보 캐시: (bot_info, 만료 시각 monotonic)
+    _bot_info_cache: Optional[tuple[dict, float]] = None
+
     def __init__(self, db: AsyncSession):
         self.db = db
         self.settings = get_settings()
         self.telegram = get_telegram_client()
         self.email = get_email_client()
+        self._pending_logs: List[NotificationLog] = []
+        # 컴파일된 규칙 평가 함수 (인스턴스 단위: 한 번의 스윕 동안 규칙 수만큼만 유지)
+        self._compiled_evaluators: dict[tuple, Callable[["AlertService", datetime], Awaitable[List[dict]]]] = {}
+        # 채널 → 발송 메서드
+        self._dispatch: dict[NotificationChannel, Callable[..., Awaitable[None]]] = {
+            NotificationChannel.TELEGRAM: self._send_telegram,
+            NotificationChannel.EMAIL: self._send_email,
+            NotificationChannel.BOTH: self._send_both,
+        }
 
     # ============ CRUD Operations ============
 
@@ -38,14 +135,21 @@ class AlertService:
         self,
         enabled_only: bool = False,
         alert_type: Optional[AlertType] = None,
+        eligible_at: Optional[datetime] = None,
     ) -> List[AlertRule]:
-        """알림 규칙 목록 조회."""
+        """알림 규칙 목록 조회 (eligible_at 지정 시 그 시각에 쿨다운이 끝난 규칙만)."""
         query = select(AlertRule)
 
         if enabled_only:
             query = query.where(AlertRule.is_enabled == True)
         if alert_type:
             query = query.where(AlertRule.alert_type == alert_type)
+        if eligible_at:
+            query = query.where(or_(
+                AlertRule.last_triggered_at.is_(None),
+                AlertRule.last_triggered_at
+                + func.make_interval(0, 0, 0, 0, 0, AlertRule.cooldown_minutes) <= eligible_at,
+            ))
 
         query = query.order_by(AlertRule.created_at.desc())
         result = await self.db.execute(query)
@@ -68,29 +172,39 @@ class AlertService:
         return rule
 
     async def update_rule(self, rule_id: UUID, data: dict) -> Optional[AlertRule]:
-        """알림 규칙 수정."""
-        rule = await self.get_rule(rule_id)
+        """알림 규칙 수정 (UPDATE ... RETURNING 한 번으로 처리)."""
+        values = {key: value for key, value in data.items() if value is not None}
+        if not values:
+            return await self.get_rule(rule_id)
+
+        result = await self.db.execute(
+            update(AlertRule)
+            .where(AlertRule.id == rule_id)
+            .values(**values)
+            .returning(AlertRule)
+            .execution_options(populate_existing=True)
+        )
+        rule = result.scalar_one_or_none()
         if not rule:
             return None
 
-        for key, value in data.items():
-            if value is not None:
-                setattr(rule, key, value)
-
         await self.db.commit()
-        await self.db.refresh(rule)
+        self._compiled_evaluators.clear()
         logger.info(f"알림 규칙 수정: {rule.name}")
         return rule
 
     async def delete_rule(self, rule_id: UUID) -> bool:
-        """알림 규칙 삭제."""
-        rule = await self.get_rule(rule_id)
-        if not rule:
+        """알림 규칙 삭제 (DELETE ... RETURNING 한 번으로 처리)."""
+        result = await self.db.execute(
+            delete(AlertRule).where(AlertRule.id == rule_id).returning(AlertRule.name)
+        )
+        name = result.scalar_one_or_none()
+        if name is None:
             return False
 
-        await self.db.delete(rule)
         await self.db.commit()
-        logger.info(f"알림 규칙 삭제: {rule.name}")
+        self._compiled_evaluators.clear()
+        logger.info(f"알림 규칙 삭제: {name}")
         return True
 
     # ============ Notification Logs ============
@@ -126,7 +240,7 @@ class AlertService:
         related_entity_type: Optional[str] = None,
         related_entity_id: Optional[str] = None,
     ) -> NotificationLog:
-        """알림 로그 생성."""
+        """알림 로그 생성 (커밋은 flush_logs에서 일괄 처리)."""
         log = NotificationLog(
             alert_rule_id=alert_rule_id,
             alert_type=alert_type,
@@ -139,12 +253,62 @@ class AlertService:
             related_entity_type=related_entity_type,
             related_entity_id=related_entity_id,
         )
-        self.db.add(log)
-        await self.db.commit()
+        self._pending_logs.append(log)
         return log
 
+    async def flush_logs(self):
+        """대기 중인 알림 로그를 한 번에 저장."""
+        self.db.add_all(self._pending_logs)
+        await self.db.commit()
+        self._pending_logs.clear()
+
     # ============ Notification Sending ============
 
+    async def _send_telegram(
+        self, title: str, message: str, recipient: Optional[str], alert_type: Optional[str]
+    ) -> None:
+        await self.telegram.send_alert(
+            title=title,
+            message=message,
+            chat_id=recipient,
+            alert_type=alert_type,
+        )
+
+    async def _send_email(
+        self, title: str, message: str, recipient: Optional[str], alert_type: Optional[str]
+    ) -> None:
+        if not recipient:
+            raise ValueError("이메일 수신자가 지정되지 않았습니다.")
+        await self.email.send_alert_async(
+            to_email=recipient,
+            title=title,
+            message=message,
+            alert_type=alert_type,
+        )
+
+    async def _send_both(
+        self, title: str, message: str, recipient: Optional[str], alert_type: Optional[str]
+    ) -> None:
+        """텔레그램 + 이메일 동시 발송 (일부 실패해도 성공으로 처리)."""
+        sends = {
+            "텔레그램": self.telegram.send_alert(
+                title=title,
+                message=message,
+                alert_type=alert_type,
+            ),
+        }
+        if recipient:
+            sends["이메일"] = self.email.send_alert_async(
+                to_email=recipient,
+                title=title,
+                message=message,
+                alert_type=alert_type,
+            )
+        results = await asyncio.gather(*sends.values(), return_exceptions=True)
+        for name, result in zip(sends, results):
+            if isinstance(result, Exception):
+                logger.warning(f"{name} 발송 실패 (BOTH 모드): {result}")
+
     async def send_notification(
         self,
         channel: NotificationChannel,
@@ -155,6 +319,7 @@ class AlertService:
         alert_rule_id: Optional[UUID] = None,
         related_entity_type: Optional[str] = None,
         related_entity_id: Optional[str] = None,
+        flush_log: bool = True,
     ) -> bool:
         """
         알림 발송.
@@ -168,59 +333,20 @@ class AlertService:
             alert_rule_id: 연관 규칙 ID
             related_entity_type: 관련 엔티티 타입
             related_entity_id: 관련 엔티티 ID
+            flush_log: False면 로그를 즉시 저장하지 않고 flush_logs 호출 시 일괄 저장
 
         Returns:
             발송 성공 여부
         """
         success = False
         error_message = None
+        alert_type_value = alert_type.value if alert_type else None
 
         try:
-            if channel == NotificationChannel.TELEGRAM:
-                await self.telegram.send_alert(
-                    title=title,
-                    message=message,
-                    chat_id=recipient,
-                    alert_type=alert_type.value if alert_type else None,
-                )
-                success = True
-
-            elif channel == NotificationChannel.EMAIL:
-                if not recipient:
-                    raise ValueError("이메일 수신자가 지정되지 않았습니다.")
-                self.email.send_alert(
-                    to_email=recipient,
-                    title=title,
-                    message=message,
-                    alert_type=alert_type.value if alert_type else None,
-                )
+            send = self._dispatch.get(channel)
+            if send:
+                await send(title, message, recipient, alert_type_value)
                 success = True
-
-            elif channel == NotificationChannel.BOTH:
-                # 텔레그램 발송
-                try:
-                    await self.telegram.send_alert(
-                        title=title,
-                        message=message,
-                        alert_type=alert_type.value if alert_type else None,
-                    )
-                except Exception as e:
-                    logger.warning(f"텔레그램 발송 실패 (BOTH 모드): {e}")
-
-                # 이메일 발송
-                if recipient:
-                    try:
-                        self.email.send_alert(
-                            to_email=recipient,
-                            title=title,
-                            message=message,
-                            alert_type=alert_type.value if alert_type else None,
-                        )
-                    except Exception as e:
-                        logger.warning(f"이메일 발송 실패 (BOTH 모드): {e}")
-
-                success = True  # BOTH는 일부 실패해도 성공으로 처리
-
         except Exception as e:
             error_message = str(e)
             logger.error(f"알림 발송 실패: {e}")
@@ -238,6 +364,8 @@ class AlertService:
             related_entity_type=related_entity_type,
             related_entity_id=related_entity_id,
         )
+        if flush_log:
+            await self.flush_logs()
 
         return success
 
@@ -250,24 +378,27 @@ class AlertService:
         Returns:
             발송된 알림 수
         """
-        rules = await self.get_rules(enabled_only=True)
-        triggered_count = 0
+        # 스윕 기준 시각 (쿨다운·조회 기간·발송 시각에 공통 사용)
+        now = now_kst().replace(tzinfo=None)
 
-        for rule in rules:
-            try:
-                # 쿨다운 체크
-                if rule.last_triggered_at:
-                    cooldown_until = rule.last_triggered_at + timedelta(
-                        minutes=rule.cooldown_minutes
-                    )
-                    if now_kst().replace(tzinfo=None) < cooldown_until:
-                        continue
+        # 쿨다운 중인 규칙은 DB에서 제외
+        eligible = await self.get_rules(enabled_only=True, eligible_at=now)
+
+        # 규칙 평가/발송은 DB·HTTP·SMTP 대기 위주 → 동시 실행 (규칙별 세션 사용)
+        semaphore = asyncio.Semaphore(self.settings.alert_concurrency)
+        triggered_rule_ids = set()
+
+        async def _process_rule(rule: AlertRule) -> int:
+            async with semaphore, async_session_maker() as session:
+                worker = AlertService(session)
+                worker._pending_logs = self._pending_logs  # 로그는 메인 세션에서 일괄 저장
 
                 # 규칙 유형별 처리
-                alerts = await self._evaluate_rule(rule)
+                alerts = await worker._evaluate_rule(rule, now)
 
+                sent = 0
                 for alert_data in alerts:
-                    success = await self.send_notification(
+                    success = await worker.send_notification(
                         channel=rule.channel,
                         title=alert_data["title"],
                         message=alert_data["message"],
@@ -275,72 +406,85 @@ class AlertService:
                         alert_rule_id=rule.id,
                         related_entity_type=alert_data.get("entity_type"),
                         related_entity_id=alert_data.get("entity_id"),
+                        flush_log=False,
                     )
 
                     if success:
-                        triggered_count += 1
-                        # 마지막 발송 시간 업데이트
-                        rule.last_triggered_at = now_kst().replace(tzinfo=None)
-                        await self.db.commit()
+                        sent += 1
+                        triggered_rule_ids.add(rule.id)
+                return sent
 
-            except Exception as e:
-                logger.error(f"알림 규칙 처리 오류 ({rule.name}): {e}")
+        results = await asyncio.gather(
+            *(_process_rule(rule) for rule in eligible), return_exceptions=True
+        )
+
+        triggered_count = 0
+        for rule, result in zip(eligible, results):
+            if isinstance(result, BaseException):
+                logger.error(f"알림 규칙 처리 오류 ({rule.name}): {result}")
+            else:
+                triggered_count += result
+
+        # 마지막 발송 시간 일괄 업데이트 + 로그 일괄 저장 (스윕당 1회 커밋)
+        if triggered_rule_ids:
+            await self.db.execute(
+                update(AlertRule)
+                .where(AlertRule.id.in_(list(triggered_rule_ids)))
+                .values(last_triggered_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        await self.flush_logs()
 
         logger.info(f"알림 체크 완료: {triggered_count}건 발송")
         return triggered_count
 
-    async def _evaluate_rule(self, rule: AlertRule) -> List[dict]:
+    def _compile_rule(self, rule: AlertRule) -> Callable[["AlertService", datetime], Awaitable[List[dict]]]:
+        """규칙을 조건 설정이 바인딩된 평가 함수로 변환 (alert_type + conditions 기준 캐시)."""
+        key = (rule.alert_type, json.dumps(rule.conditions, sort_keys=True, default=str))
+        evaluator = self._compiled_evaluators.get(key)
+        if evaluator is None:
+            check = self._RULE_CHECKS.get(rule.alert_type)
+            if check is None:
+                evaluator = _no_alerts
+            else:
+                method_name, conditions_type = check
+                evaluator = functools.partial(
+                    getattr(AlertService, method_name),
+                    cfg=conditions_type.from_conditions(rule.conditions),
+                )
+            self._compiled_evaluators[key] = evaluator
+        return evaluator
+
+    async def _evaluate_rule(self, rule: AlertRule, now: datetime) -> List[dict]:
         """
         알림 규칙을 평가하고 발송할 알림 목록 반환.
 
+        Args:
+            now: 스윕 기준 시각 (KST, naive)
+
         Returns:
             발송할 알림 데이터 목록 [{title, message, entity_type, entity_id}, ...]
         """
-        if rule.alert_type == AlertType.YOUTUBE_SURGE:
-            return await self._check_youtube_surge(rule.conditions)
-
-        elif rule.alert_type == AlertType.DISCLOSURE_IMPORTANT:
-            return await self._check_important_disclosures(rule.conditions)
-
-        elif rule.alert_type == AlertType.FOMO_WARNING:
-            return await self._check_fomo_warning(rule.conditions)
-
-        elif rule.alert_type == AlertType.TARGET_REACHED:
-            return await self._check_target_reached(rule.conditions)
-
-        elif rule.alert_type == AlertType.TIME_EXPIRED:
-            return await self._check_time_expired(rule.conditions)
-
-        elif rule.alert_type == AlertType.EXPERT_NEW_MENTION:
-            if not self.settings.expert_feature_enabled:
-                return []
-            return await self._check_expert_new_mentions(rule.conditions)
-
-        elif rule.alert_type == AlertType.EXPERT_CROSS_CHECK:
-            if not self.settings.expert_feature_enabled:
-                return []
-            return await self._check_expert_cross_check(rule.conditions)
+        # 전문가 기능 플래그는 캐시 키에 없으므로 평가 시점마다 확인
+        if rule.alert_type in self._EXPERT_ALERT_TYPES and not self.settings.expert_feature_enabled:
+            return []
+        return await self._compile_rule(rule)(self, now=now)
 
-        return []
-
-    async def _check_youtube_surge(self, conditions: dict) -> List[dict]:
+    async def _check_youtube_surge(self, cfg: YouTubeSurgeConditions, now: datetime) -> List[dict]:
         """YouTube 급증 체크."""
         alerts = []
 
-        threshold = conditions.get("threshold", 5)  # 언급 급증 기준
-        hours = conditions.get("time_window_hours", 24)
-
-        since = now_kst().replace(tzinfo=None) - timedelta(hours=hours)
+        since = now - timedelta(hours=cfg.time_window_hours)
 
         # 최근 기간 내 언급이 급증한 종목 조회
-        result = await self.db.execute(
+        result = await self.db.stream_scalars(
             select(TickerMentionStats)
             .where(TickerMentionStats.updated_at >= since)
-            .where(TickerMentionStats.mention_count_7d >= threshold)
+            .where(TickerMentionStats.mention_count_7d >= cfg.threshold)
+            .execution_options(yield_per=STREAM_YIELD_PER)
         )
-        stats_list = result.scalars().all()
 
-        for stats in stats_list:
+        async for stats in result:
             # 이전 대비 급증 여부 확인 (간단히 7일 vs 30일 비교)
             if stats.mention_count_30d > 0:
                 growth_rate = stats.mention_count_7d / (stats.mention_count_30d / 4)
@@ -354,27 +498,26 @@ class AlertService:
 
         return alerts
 
-    async def _check_important_disclosures(self, conditions: dict) -> List[dict]:
+    async def _check_important_disclosures(self, cfg: DisclosureConditions, now: datetime) -> List[dict]:
         """중요 공시 체크."""
         alerts = []
 
-        hours = conditions.get("time_window_hours", 24)
-        stock_codes = conditions.get("stock_codes", [])
-
-        since = now_kst().replace(tzinfo=None) - timedelta(hours=hours)
+        since = now - timedelta(hours=cfg.time_window_hours)
 
         query = select(Disclosure).where(
             Disclosure.published_at >= since,
             Disclosure.importance == DisclosureImportance.HIGH,
         )
 
-        if stock_codes:
-            query = query.where(Disclosure.stock_code.in_(stock_codes))
+        if cfg.stock_codes:
+            # 배열 파라미터 1개로 바인딩 → 종목 수와 무관하게 같은 SQL (플랜 재사용)
+            query = query.where(Disclosure.stock_code == any_(
+                bindparam("stock_codes", value=list(cfg.stock_codes), type_=ARRAY(String))
+            ))
 
-        result = await self.db.execute(query)
-        disclosures = result.scalars().all()
+        result = await self.db.stream_scalars(query.execution_options(yield_per=STREAM_YIELD_PER))
 
-        for disc in disclosures:
+        async for disc in result:
             alerts.append({
                 "title": f"중요 공시: {disc.stock_code}",
                 "message": f"{disc.title}\n\n📅 {disc.published_at.strftime('%Y-%m-%d %H:%M')}",
@@ -384,78 +527,71 @@ class AlertService:
 
         return alerts
 
-    async def _check_fomo_warning(self, conditions: dict) -> List[dict]:
+    async def _check_fomo_warning(self, cfg: FomoWarningConditions, now: datetime) -> List[dict]:
         """FOMO 위험 경고 체크."""
         alerts = []
 
-        # 보유 중인 아이디어 중 FOMO 점수가 높은 것
-        result = await self.db.execute(
-            select(InvestmentIdea).where(
-                InvestmentIdea.status.in_([IdeaStatus.ACTIVE, IdeaStatus.WATCHING])
+        # 보유 중인 아이디어 중 FOMO 점수가 높은 것 (점수 계산/필터는 DB에서)
+        result = await self.db.stream_scalars(
+            select(InvestmentIdea)
+            .where(
+                InvestmentIdea.status.in_([IdeaStatus.ACTIVE, IdeaStatus.WATCHING]),
+                _fomo_score_sql() >= cfg.fomo_score_threshold,
             )
+            .execution_options(yield_per=STREAM_YIELD_PER)
         )
-        ideas = result.scalars().all()
-
-        fomo_threshold = conditions.get("fomo_score_threshold", 70)
 
-        for idea in ideas:
-            # FOMO 점수 계산 (간단 버전)
+        async for idea in result:
             fomo_score = self._calculate_fomo_score(idea)
-            if fomo_score >= fomo_threshold:
-                alerts.append({
-                    "title": f"FOMO 위험 경고: {idea.stock_code}",
-                    "message": f"FOMO 점수: {fomo_score}/100\n근거: {idea.thesis[:100]}..." if idea.thesis else "",
-                    "entity_type": "idea",
-                    "entity_id": str(idea.id),
-                })
+            alerts.append({
+                "title": f"FOMO 위험 경고: {', '.join(idea.tickers or [])}",
+                "message": f"FOMO 점수: {fomo_score}/100\n근거: {idea.thesis[:100]}..." if idea.thesis else "",
+                "entity_type": "idea",
+                "entity_id": str(idea.id),
+            })
 
         return alerts
 
     def _calculate_fomo_score(self, idea: InvestmentIdea) -> int:
-        """간단한 FOMO 점수 계산."""
-        score = 0
-
-        # 목표 상승률이 너무 높으면 FOMO 위험
-        if idea.target_price and idea.entry_price:
-            expected_return = (idea.target_price - idea.entry_price) / idea.entry_price * 100
+        """간단한 FOMO 점수 계산 (_fomo_score_sql과 동일 기준)."""
+        # 근거가 짧으면 충동적 판단 위험 (정수 비교 → 먼저)
+        thesis_len = len(idea.thesis) if idea.thesis else 0
+        score = 20 if 0 < thesis_len < 50 else 0
+
+        # 목표 상승률이 너무 높으면 FOMO 위험 (Decimal 비교, 값 없으면 생략)
+        expected_return = idea.target_return_pct
+        if expected_return is not None:
             if expected_return > 50:
                 score += 30
             elif expected_return > 30:
                 score += 15
 
-        # 근거가 짧으면 충동적 판단 위험
-        if idea.thesis and len(idea.thesis) < 50:
-            score += 20
-
-        # 확신도가 높으면서 근거가 부실하면 위험
-        if idea.conviction_level and idea.conviction_level >= 8:
-            if not idea.thesis or len(idea.thesis) < 100:
-                score += 25
-
         return min(score, 100)
 
-    async def _check_target_reached(self, conditions: dict) -> List[dict]:
+    async def _check_target_reached(self, cfg: RuleConditions, now: datetime) -> List[dict]:
         """목표가 도달 체크."""
         # 실제 구현 시 가격 서비스와 연동 필요
         return []
 
-    async def _check_time_expired(self, conditions: dict) -> List[dict]:
+    async def _check_time_expired(self, cfg: RuleConditions, now: datetime) -> List[dict]:
         """예상 기간 초과 체크."""
         alerts = []
+        today = now.date()
 
-        result = await self.db.execute(
-            select(InvestmentIdea).where(
+        result = await self.db.stream_scalars(
+            select(InvestmentIdea)
+            .where(
                 InvestmentIdea.status == IdeaStatus.ACTIVE,
                 InvestmentIdea.expected_date.isnot(None),
-                InvestmentIdea.expected_date < today_kst(),
+                InvestmentIdea.expected_date < today,
             )
+            .execution_options(yield_per=STREAM_YIELD_PER)
         )
-        ideas = result.scalars().all()
 
-        for idea in ideas:
-            days_over = (today_kst() - idea.expected_date).days
+        async for idea in result:
+            days_over = (today - idea.expected_date).days
             alerts.append({
-                "title": f"예상 기간 초과: {idea.stock_code}",
+                "title": f"예상 기간 초과: {', '.join(idea.tickers or [])}",
                 "message": f"예상일로부터 {days_over}일 경과\n원래 예상일: {idea.expected_date}",
                 "entity_type": "idea",
                 "entity_id": str(idea.id),
@@ -463,14 +599,12 @@ class AlertService:
 
         return alerts
 
-    async def _check_expert_new_mentions(self, conditions: dict) -> List[dict]:
+    async def _check_expert_new_mentions(self, cfg: ExpertNewMentionConditions, now: datetime) -> List[dict]:
         """전문가 신규 언급 체크."""
         alerts = []
 
-        hours = conditions.get("time_window_hours", 24)
-        min_mentions = conditions.get("min_mentions", 2)  # 최소 언급 횟수
-
-        since = now_kst().replace(tzinfo=None) - timedelta(hours=hours)
+        hours = cfg.time_window_hours
+        since = now - timedelta(hours=hours)
 
         # 최근 기간 내 신규 언급된 종목
         result = await self.db.execute(
@@ -481,7 +615,7 @@ class AlertService:
             )
             .where(ExpertMention.created_at >= since)
             .group_by(ExpertMention.stock_name, ExpertMention.stock_code)
-            .having(func.count(ExpertMention.id) >= min_mentions)
+            .having(func.count(ExpertMention.id) >= cfg.min_mentions)
         )
         mentions = result.all()
 
@@ -495,54 +629,46 @@ class AlertService:
 
         return alerts
 
-    async def _check_expert_cross_check(self, conditions: dict) -> List[dict]:
+    async def _check_expert_cross_check(self, cfg: ExpertCrossCheckConditions, now: datetime) -> List[dict]:
         """내 아이디어 종목과 전문가 언급 교차 체크."""
         alerts = []
 
-        hours = conditions.get("time_window_hours", 24)
-
-        since = now_kst().replace(tzinfo=None) - timedelta(hours=hours)
+        hours = cfg.time_window_hours
+        since = now - timedelta(hours=hours)
 
-        # 내 활성 아이디어의 종목 코드
-        ideas_result = await self.db.execute(
-            select(InvestmentIdea).where(
-                InvestmentIdea.status.in_([IdeaStatus.ACTIVE, IdeaStatus.WATCHING])
+        # 내 활성 아이디어의 종목 (tickers JSON 배열 펼침, 종목당 아이디어 1개)
+        idea_tickers = (
+            select(
+                func.json_array_elements_text(InvestmentIdea.tickers).label("ticker"),
+                InvestmentIdea.thesis.label("thesis"),
             )
+            .where(InvestmentIdea.status.in_([IdeaStatus.ACTIVE, IdeaStatus.WATCHING]))
+            .subquery()
+        )
+        ticker_ideas = (
+            select(idea_tickers.c.ticker, func.min(idea_tickers.c.thesis).label("idea_thesis"))
+            .group_by(idea_tickers.c.ticker)
+            .subquery()
         )
-        ideas = ideas_result.scalars().all()
-
-        idea_tickers = set()
-        idea_map = {}  # stock_code -> idea
-        for idea in ideas:
-            if idea.tickers:
-                for ticker in idea.tickers:
-                    idea_tickers.add(ticker)
-                    idea_map[ticker] = idea
-
-        if not idea_tickers:
-            return alerts
 
-        # 전문가가 언급한 종목 중 내 종목
+        # 전문가가 언급한 종목 중 내 종목 (JOIN 한 번으로 조회)
         result = await self.db.execute(
             select(
                 ExpertMention.stock_name,
                 ExpertMention.stock_code,
                 func.count(ExpertMention.id).label("mention_count"),
+                ticker_ideas.c.idea_thesis,
             )
-            .where(
-                ExpertMention.created_at >= since,
-                ExpertMention.stock_code.in_(list(idea_tickers)),
-            )
-            .group_by(ExpertMention.stock_name, ExpertMention.stock_code)
+            .join(ticker_ideas, ticker_ideas.c.ticker == ExpertMention.stock_code)
+            .where(ExpertMention.created_at >= since)
+            .group_by(ExpertMention.stock_name, ExpertMention.stock_code, ticker_ideas.c.idea_thesis)
         )
-        mentions = result.all()
 
-        for mention in mentions:
-            idea = idea_map.get(mention.stock_code)
-            idea_title = idea.title if idea else "알 수 없음"
+        for mention in result:
+            idea_label = (mention.idea_thesis or "알 수 없음")[:30]
             alerts.append({
                 "title": f"전문가도 주목: {mention.stock_name}",
-                "message": f"내 아이디어 '{idea_title}'의 종목\n최근 {hours}시간 동안 전문가 {mention.mention_count}회 언급",
+                "message": f"내 아이디어 '{idea_label}'의 종목\n최근 {hours}시간 동안 전문가 {mention.mention_count}회 언급",
                 "entity_type": "expert_cross_check",
                 "entity_id": mention.stock_code,
             })
@@ -551,25 +677,50 @@ class AlertService:
 
     # ============ Settings ============
 
+    async def _get_bot_info(self) -> dict:
+        """텔레그램 봇 정보 (getMe 결과를 BOT_INFO_TTL_SECONDS 동안 캐시)."""
+        cached = AlertService._bot_info_cache
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+
+        bot_info = await self.telegram.test_connection()
+        AlertService._bot_info_cache = (bot_info, time.monotonic() + BOT_INFO_TTL_SECONDS)
+        return bot_info
+
+    async def _count_rules(self) -> tuple[int, int]:
+        """전체/활성 규칙 수 (한 번의 집계 쿼리)."""
+        result = await self.db.execute(
+            select(
+                func.count(AlertRule.id),
+                func.coalesce(func.sum(case((AlertRule.is_enabled == True, 1), else_=0)), 0),
+            )
+        )
+        total, enabled = result.one()
+        return total, enabled
+
+    async def _get_bot_username(self) -> Optional[str]:
+        """텔레그램 봇 username (미설정/오류 시 None)."""
+        if not self.telegram.is_configured:
+            return None
+        try:
+            bot_info = await self._get_bot_info()
+            return bot_info.get("username")
+        except Exception:
+            return None
+
     async def get_settings_status(self) -> dict:
         """알림 설정 현황 조회."""
-        telegram_bot_username = None
-        if self.telegram.is_configured:
-            try:
-                bot_info = await self.telegram.test_connection()
-                telegram_bot_username = bot_info.get("username")
-            except:
-                pass
-
-        # 규칙 통계
-        all_rules = await self.get_rules()
-        enabled_rules = [r for r in all_rules if r.is_enabled]
+        # 봇 정보 조회(HTTP)와 규칙 통계(DB)를 동시에 수행
+        telegram_bot_username, (total_rules, enabled_rules) = await asyncio.gather(
+            self._get_bot_username(),
+            self._count_rules(),
+        )
 
         return {
             "telegram_configured": self.telegram.is_configured,
             "telegram_bot_username": telegram_bot_username,
             "email_configured": self.email.is_configured,
             "smtp_host": self.settings.smtp_host if self.email.is_configured else None,
-            "total_rules": len(all_rules),
-            "enabled_rules": len(enabled_rules),
+            "total_rules": total_rules,
+            "enabled_rules": enabled_rules,
         }
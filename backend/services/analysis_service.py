@@ -1,62 +1,80 @@
-import math
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import List, Optional
-from collections import defaultdict, Counter
+
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import case, extract, func, select
 
 from models import InvestmentIdea, Position, IdeaType, IdeaStatus, Trade, TradeType
 from schemas.analysis import TimelineAnalysis, TimelineEntry, FomoAnalysis, FomoExit
 
 
+CLOSED_POSITIONS_YIELD_PER = 1000
+
+_CLOSED_POSITION_DTYPE = np.dtype([("pct", "f8"), ("exit_date", "M8[D]"), ("days_held", "i8")])
+
+
 class AnalysisService:
     def __init__(self, db: Session):
         self.db = db
+        # 요청 단위 청산 포지션 조회 결과 ((start_date, end_date) → 배열)
+        self._closed_positions: dict[tuple, tuple] = {}
 
     def get_timeline_analysis(self) -> TimelineAnalysis:
-        positions = (
-            self.db.query(Position)
-            .join(InvestmentIdea)
-            .filter(Position.exit_date.isnot(None))
-            .all()
-        )
-
-        entries = []
-        early_exits = 0
-        on_time_exits = 0
-        late_exits = 0
-        time_diffs = []
-
-        for pos in positions:
-            idea = pos.idea
-            expected_exit_date = pos.entry_date.toordinal() + idea.expected_timeframe_days
-            actual_exit_date = pos.exit_date.toordinal()
-            time_diff = actual_exit_date - expected_exit_date
-
-            if time_diff < -7:
-                early_exits += 1
-            elif time_diff > 7:
-                late_exits += 1
-            else:
-                on_time_exits += 1
-
-            time_diffs.append(time_diff)
-
-            entries.append(TimelineEntry(
-                idea_id=idea.id,
-                idea_type=idea.type,
-                ticker=pos.ticker,
-                entry_date=pos.entry_date,
-                exit_date=pos.exit_date,
-                days_held=pos.days_held,
-                expected_days=idea.expected_timeframe_days,
-                time_diff_days=time_diff,
-                return_pct=pos.realized_return_pct,
-                exit_reason=pos.exit_reason,
-            ))
-
-        avg_time_diff = sum(time_diffs) / len(time_diffs) if time_diffs else 0
+        rows = self.db.execute(
+            select(
+                InvestmentIdea.id,
+                InvestmentIdea.type,
+                InvestmentIdea.expected_timeframe_days,
+                Position.ticker,
+                Position.entry_date,
+                Position.exit_date,
+                Position.entry_price,
+                Position.exit_price,
+                Position.exit_reason,
+            )
+            .join(InvestmentIdea, Position.idea_id == InvestmentIdea.id)
+            .where(Position.exit_date.isnot(None))
+        ).all()
+
+        # 행 순회 1회로 (진입일, 청산일, 예상 기간) 배열을 만들고 (실제 - 예상 청산일) 계산
+        count = len(rows)
+        dates = np.fromiter(
+            (
+                value
+                for r in rows
+                for value in (r.entry_date.toordinal(), r.exit_date.toordinal(), r.expected_timeframe_days)
+            ),
+            dtype=np.int64,
+            count=count * 3,
+        ).reshape(count, 3)
+        days_held = dates[:, 1] - dates[:, 0]
+        time_diffs = days_held - dates[:, 2]
+
+        early_exits = int((time_diffs < -7).sum())
+        late_exits = int((time_diffs > 7).sum())
+        on_time_exits = count - early_exits - late_exits
+        avg_time_diff = float(time_diffs.mean()) if count else 0
+
+        entries = [
+            TimelineEntry(
+                idea_id=r.id,
+                idea_type=r.type,
+                ticker=r.ticker,
+                entry_date=r.entry_date,
+                exit_date=r.exit_date,
+                days_held=held,
+                expected_days=r.expected_timeframe_days,
+                time_diff_days=diff,
+                return_pct=(
+                    float((r.exit_price - r.entry_price) / r.entry_price * 100)
+                    if r.exit_price is not None else None
+                ),
+                exit_reason=r.exit_reason,
+            )
+            for r, diff, held in zip(rows, time_diffs.tolist(), days_held.tolist())
+        ]
 
         return TimelineAnalysis(
             entries=entries,
@@ -67,40 +85,43 @@ class AnalysisService:
         )
 
     def get_fomo_analysis(self) -> FomoAnalysis:
-        fomo_positions = (
-            self.db.query(Position)
-            .join(InvestmentIdea)
-            .filter(
-                and_(
-                    Position.exit_reason == "fomo",
-                    InvestmentIdea.type == IdeaType.RESEARCH,
-                )
+        rows = self.db.execute(
+            select(
+                Position.idea_id,
+                Position.ticker,
+                Position.exit_date,
+                Position.entry_price,
+                Position.exit_price,
             )
-            .all()
-        )
-
-        fomo_exits = []
-        missed_returns = []
-
-        for pos in fomo_positions:
-            exit_return = pos.realized_return_pct or 0
-
-            fomo_exits.append(FomoExit(
-                idea_id=pos.idea_id,
-                ticker=pos.ticker,
-                exit_date=pos.exit_date,
-                exit_return_pct=exit_return,
+            .join(InvestmentIdea, Position.idea_id == InvestmentIdea.id)
+            .where(
+                Position.exit_reason == "fomo",
+                InvestmentIdea.type == IdeaType.RESEARCH,
+            )
+        ).all()
+
+        # 청산 후 가격 추적은 아직 없으므로 놓친 수익 관련 값은 비워둔다
+        fomo_exits = [
+            FomoExit(
+                idea_id=r.idea_id,
+                ticker=r.ticker,
+                exit_date=r.exit_date,
+                # Position.realized_return_pct와 같은 계산 (청산가 없으면 0)
+                exit_return_pct=(
+                    float((r.exit_price - r.entry_price) / r.entry_price * 100)
+                    if r.exit_price is not None else 0
+                ),
                 days_after_exit=0,
                 price_after_exit=None,
                 missed_return_pct=None,
-            ))
-
-        avg_missed = sum(missed_returns) / len(missed_returns) if missed_returns else None
+            )
+            for r in rows
+        ]
 
         return FomoAnalysis(
             fomo_exits=fomo_exits,
             total_fomo_exits=len(fomo_exits),
-            avg_missed_return_pct=avg_missed,
+            avg_missed_return_pct=None,
             total_missed_opportunity=None,
             summary={
                 "message": f"총 {len(fomo_exits)}건의 FOMO 청산이 있었습니다.",
@@ -109,30 +130,38 @@ class AnalysisService:
         )
 
     def get_performance_by_type(self) -> dict:
-        ideas = self.db.query(InvestmentIdea).filter(InvestmentIdea.status == IdeaStatus.EXITED).all()
-
-        research_returns = []
-        chart_returns = []
+        # 청산 수익률 (Position.realized_return_pct와 동일 계산) 을 유형별로 DB에서 집계
+        return_pct = (Position.exit_price - Position.entry_price) / Position.entry_price * 100
+        rows = self.db.execute(
+            select(
+                InvestmentIdea.type,
+                func.count(),
+                func.avg(return_pct),
+                func.sum(case((return_pct > 0, 1), else_=0)),
+            )
+            .join(Position, Position.idea_id == InvestmentIdea.id)
+            .where(
+                InvestmentIdea.status == IdeaStatus.EXITED,
+                Position.exit_price.isnot(None),
+            )
+            .group_by(InvestmentIdea.type)
+        ).all()
 
-        for idea in ideas:
-            for pos in idea.positions:
-                if pos.realized_return_pct is not None:
-                    if idea.type == IdeaType.RESEARCH:
-                        research_returns.append(pos.realized_return_pct)
-                    else:
-                        chart_returns.append(pos.realized_return_pct)
+        # RESEARCH 외 유형은 chart로 합산
+        stats = {"research": [0, 0.0, 0], "chart": [0, 0.0, 0]}
+        for idea_type, count, avg_return, wins in rows:
+            bucket = stats["research" if idea_type == IdeaType.RESEARCH else "chart"]
+            bucket[0] += count
+            bucket[1] += float(avg_return) * count
+            bucket[2] += wins
 
         return {
-            "research": {
-                "count": len(research_returns),
-                "avg_return": sum(research_returns) / len(research_returns) if research_returns else None,
-                "win_rate": len([r for r in research_returns if r > 0]) / len(research_returns) if research_returns else None,
-            },
-            "chart": {
-                "count": len(chart_returns),
-                "avg_return": sum(chart_returns) / len(chart_returns) if chart_returns else None,
-                "win_rate": len([r for r in chart_returns if r > 0]) / len(chart_returns) if chart_returns else None,
-            },
+            key: {
+                "count": count,
+                "avg_return": total / count if count else None,
+                "win_rate": wins / count if count else None,
+            }
+            for key, (count, total, wins) in stats.items()
         }
 
     def get_risk_metrics(self, start_date: date | None = None, end_date: date | None = None) -> dict:
@@ -140,45 +169,29 @@ class AnalysisService:
 
         MDD, 샤프 비율, 승률 추이, 연속 손실, 포지션 집중도를 계산합니다.
         """
-        # 청산된 포지션 (날짜순)
-        query = (
-            self.db.query(Position)
-            .filter(Position.exit_date.isnot(None))
-            .order_by(Position.exit_date)
-        )
-        if start_date:
-            query = query.filter(Position.exit_date >= start_date)
-        if end_date:
-            query = query.filter(Position.exit_date <= end_date)
-        closed_positions = query.all()
-
-        returns = []
-        for pos in closed_positions:
-            if pos.realized_return_pct is not None:
-                returns.append({
-                    "return_pct": float(pos.realized_return_pct),
-                    "exit_date": pos.exit_date.isoformat() if pos.exit_date else None,
-                    "ticker": pos.ticker,
-                    "profit": float((pos.exit_price - pos.entry_price) * pos.quantity) if pos.exit_price else 0,
-                })
+        # 청산된 포지션 (날짜순) 수익률 배열 + 청산일 목록
+        pcts, exit_dates, _ = self._load_closed_positions(start_date, end_date)
 
         # 1. MDD (Maximum Drawdown) - 누적 수익 기반
-        mdd = self._calc_mdd(returns)
+        mdd = self._calc_mdd(pcts, exit_dates)
 
         # 2. 샤프 비율 (무위험 수익률 3% 가정)
-        sharpe = self._calc_sharpe(returns, risk_free_annual=3.0)
+        sharpe = self._calc_sharpe(pcts, risk_free_annual=3.0)
+
+        # 승/패 마스크는 승률 추이와 연속 기록이 함께 사용
+        is_win = pcts > 0
 
         # 3. 승률 추이 (최근 10건씩 롤링)
-        win_rate_trend = self._calc_win_rate_trend(returns, window=10)
+        win_rate_trend = self._calc_win_rate_trend(is_win, exit_dates, window=10)
 
         # 4. 연속 손실/승리
-        streak = self._calc_streaks(returns)
+        streak = self._calc_streaks(is_win)
 
         # 5. 포지션 집중도 (현재 활성 포지션 기준)
         concentration = self._calc_concentration()
 
         # 6. 손익비 (Profit Factor)
-        profit_factor = self._calc_profit_factor(returns)
+        profit_factor = self._calc_profit_factor(pcts)
 
         return {
             "mdd": mdd,
@@ -187,28 +200,27 @@ class AnalysisService:
             "streak": streak,
             "concentration": concentration,
             "profit_factor": profit_factor,
-            "total_closed_trades": len(returns),
+            "total_closed_trades": len(pcts),
         }
 
-    def _calc_mdd(self, returns: list) -> dict:
-        if not returns:
+    def _calc_mdd(self, pcts: np.ndarray, exit_dates: list) -> dict:
+        if not len(pcts):
             return {"max_drawdown_pct": 0, "peak_date": None, "trough_date": None}
 
-        cumulative = 0.0
-        peak = 0.0
-        max_dd = 0.0
-        peak_date = returns[0]["exit_date"] if returns else None
-        trough_date = None
-
-        for r in returns:
-            cumulative += r["return_pct"]
-            if cumulative > peak:
-                peak = cumulative
-                peak_date = r["exit_date"]
-            dd = peak - cumulative
-            if dd > max_dd:
-                max_dd = dd
-                trough_date = r["exit_date"]
+        cumulative = np.cumsum(pcts)
+        # 고점은 0(시작점)부터 누적 최대값
+        peak = np.maximum.accumulate(np.concatenate(([0.0], cumulative)))
+        prev_peak, peak = peak[:-1], peak[1:]
+        drawdown = peak - cumulative
+
+        # 마지막으로 고점을 갱신한 시점 (갱신이 없으면 첫 청산일)
+        new_highs = np.flatnonzero(cumulative > prev_peak)
+        peak_date = exit_dates[new_highs[-1]] if len(new_highs) else exit_dates[0]
+
+        # 최대 낙폭이 처음 나타난 시점
+        trough_idx = int(drawdown.argmax())
+        max_dd = float(drawdown[trough_idx])
+        trough_date = exit_dates[trough_idx] if max_dd > 0 else None
 
         return {
             "max_drawdown_pct": round(max_dd, 2),
@@ -216,95 +228,68 @@ class AnalysisService:
             "trough_date": trough_date,
         }
 
-    def _calc_sharpe(self, returns: list, risk_free_annual: float = 3.0) -> Optional[float]:
-        if len(returns) < 2:
+    def _calc_sharpe(self, pcts: np.ndarray, risk_free_annual: float = 3.0) -> Optional[float]:
+        if len(pcts) < 2:
             return None
-        pcts = [r["return_pct"] for r in returns]
-        avg = sum(pcts) / len(pcts)
-        std = math.sqrt(sum((x - avg) ** 2 for x in pcts) / (len(pcts) - 1))
+        avg = float(pcts.mean())
+        std = float(pcts.std(ddof=1))
         if std == 0:
             return None
         # 거래당 수익률 기준 샤프 (연환산 아닌 거래 단위)
         risk_free_per_trade = risk_free_annual / max(len(pcts), 1)
         return round((avg - risk_free_per_trade) / std, 2)
 
-    def _calc_win_rate_trend(self, returns: list, window: int = 10) -> list:
-        if not returns:
-            return []
-        trend = []
-        for i in range(window, len(returns) + 1):
-            window_returns = returns[i - window:i]
-            wins = sum(1 for r in window_returns if r["return_pct"] > 0)
-            trend.append({
+    def _calc_win_rate_trend(self, is_win: np.ndarray, exit_dates: list, window: int = 10) -> list:
+        # 누적 승수 차분으로 구간별 승수 계산
+        cum_wins = np.concatenate(([0], np.cumsum(is_win)))
+        window_wins = (cum_wins[window:] - cum_wins[:-window]).tolist()
+        return [
+            {
                 "trade_index": i,
-                "date": window_returns[-1]["exit_date"],
+                "date": exit_dates[i - 1],
                 "win_rate": round(wins / window * 100, 1),
-            })
-        return trend
+            }
+            for i, wins in enumerate(window_wins, start=window)
+        ]
 
-    def _calc_streaks(self, returns: list) -> dict:
-        if not returns:
+    def _calc_streaks(self, is_win: np.ndarray) -> dict:
+        if not len(is_win):
             return {"max_win_streak": 0, "max_loss_streak": 0, "current_streak": 0, "current_type": None}
 
-        max_win = 0
-        max_loss = 0
-        current = 0
-        current_type = None
-
-        for r in returns:
-            is_win = r["return_pct"] > 0
-            if current_type is None:
-                current_type = "win" if is_win else "loss"
-                current = 1
-            elif (current_type == "win" and is_win) or (current_type == "loss" and not is_win):
-                current += 1
-            else:
-                if current_type == "win":
-                    max_win = max(max_win, current)
-                else:
-                    max_loss = max(max_loss, current)
-                current_type = "win" if is_win else "loss"
-                current = 1
-
-        # 마지막 streak 반영
-        if current_type == "win":
-            max_win = max(max_win, current)
-        elif current_type == "loss":
-            max_loss = max(max_loss, current)
+        # 승/패 구간(run) 단위로 분할해 구간 길이 계산
+        starts = np.flatnonzero(np.concatenate(([True], is_win[1:] != is_win[:-1])))
+        lengths = np.diff(np.append(starts, len(is_win)))
+        run_is_win = is_win[starts]
 
         return {
-            "max_win_streak": max_win,
-            "max_loss_streak": max_loss,
-            "current_streak": current,
-            "current_type": current_type,
+            "max_win_streak": int(lengths[run_is_win].max(initial=0)),
+            "max_loss_streak": int(lengths[~run_is_win].max(initial=0)),
+            "current_streak": int(lengths[-1]),
+            "current_type": "win" if run_is_win[-1] else "loss",
         }
 
     def _calc_concentration(self) -> dict:
-        active_positions = (
-            self.db.query(Position)
-            .join(InvestmentIdea)
-            .filter(
+        # 종목별 투입 금액 합계 (큰 순서)
+        amount = func.sum(Position.entry_price * Position.quantity)
+        holdings = self.db.execute(
+            select(Position.ticker, amount)
+            .join(InvestmentIdea, Position.idea_id == InvestmentIdea.id)
+            .where(
                 InvestmentIdea.status == IdeaStatus.ACTIVE,
                 Position.exit_date.is_(None),
             )
-            .all()
-        )
+            .group_by(Position.ticker)
+            .order_by(amount.desc(), Position.ticker)
+        ).all()
 
-        if not active_positions:
+        if not holdings:
             return {"hhi": 0, "top_holding_pct": 0, "holdings": []}
 
-        holdings = defaultdict(float)
-        total = 0.0
-        for pos in active_positions:
-            amount = float(pos.entry_price) * pos.quantity
-            holdings[pos.ticker] += amount
-            total += amount
-
+        total = float(sum(amt for _, amt in holdings))
         if total == 0:
             return {"hhi": 0, "top_holding_pct": 0, "holdings": []}
 
-        sorted_holdings = sorted(holdings.items(), key=lambda x: x[1], reverse=True)
-        weights = [(ticker, amount / total * 100) for ticker, amount in sorted_holdings]
+        weights = [(ticker, float(amt) / total * 100) for ticker, amt in holdings]
 
         # HHI (Herfindahl-Hirschman Index): 0~10000, 높을수록 집중
         hhi = sum(w ** 2 for _, w in weights)
@@ -318,45 +303,72 @@ class AnalysisService:
             ],
         }
 
-    def _calc_profit_factor(self, returns: list) -> Optional[float]:
-        total_profit = sum(r["return_pct"] for r in returns if r["return_pct"] > 0)
-        total_loss = abs(sum(r["return_pct"] for r in returns if r["return_pct"] < 0))
+    def _calc_profit_factor(self, pcts: np.ndarray) -> Optional[float]:
+        total_profit = float(pcts[pcts > 0].sum())
+        total_loss = float(-pcts[pcts < 0].sum())
         if total_loss == 0:
             return None if total_profit == 0 else float("inf")
         return round(total_profit / total_loss, 2)
 
+    def _load_closed_positions(self, start_date: date | None, end_date: date | None) -> tuple:
+        """청산 포지션 (청산일순)의 수익률 배열, 청산일 목록, 보유일 배열.
+
+        서비스 인스턴스(요청) 안에서 같은 기간은 한 번만 조회.
+        """
+        cache_key = (start_date, end_date)
+        cached = self._closed_positions.get(cache_key)
+        if cached is not None:
+            return cached
+
+        query = (
+            select(Position.entry_date, Position.exit_date, Position.entry_price, Position.exit_price)
+            .where(Position.exit_date.isnot(None), Position.exit_price.isnot(None))
+            .order_by(Position.exit_date)
+        )
+        if start_date:
+            query = query.where(Position.exit_date >= start_date)
+        if end_date:
+            query = query.where(Position.exit_date <= end_date)
+        # ORM 객체 없이 행을 yield_per 단위로 받아 한 번에 배열로 (Position.realized_return_pct / days_held와 같은 계산)
+        rows = self.db.execute(query.execution_options(yield_per=CLOSED_POSITIONS_YIELD_PER))
+        records = np.fromiter(
+            (
+                (
+                    float((r.exit_price - r.entry_price) / r.entry_price * 100),
+                    r.exit_date,
+                    (r.exit_date - r.entry_date).days,
+                )
+                for r in rows
+            ),
+            dtype=_CLOSED_POSITION_DTYPE,
+        )
+        pcts = np.ascontiguousarray(records["pct"])
+        exit_dates = np.datetime_as_string(records["exit_date"]).tolist()
+        days_held = np.ascontiguousarray(records["days_held"])
+
+        result = (pcts, exit_dates, days_held)
+        self._closed_positions[cache_key] = result
+        return result
+
     # ── 매매 습관/심리 분석 ──
 
     def get_trade_habits(self, start_date: date | None = None, end_date: date | None = None) -> dict:
         """매매 습관/심리 분석 종합."""
-        # 매도 거래 (실현손익이 있는 건)
-        sell_query = (
-            self.db.query(Trade)
-            .filter(
-                Trade.trade_type.in_([TradeType.SELL, TradeType.PARTIAL_SELL]),
-                Trade.realized_profit.isnot(None),
-            )
+        # 매도 거래 (실현손익이 있는 건) 수익률 배열, 거래 순서대로 (없으면 0)
+        sell_conditions = self._sell_trade_conditions(start_date, end_date)
+        sell_returns = self.db.execute(
+            select(Trade.realized_return_pct)
+            .where(*sell_conditions)
             .order_by(Trade.trade_date, Trade.created_at)
+        ).scalars().all()
+        sell_pcts = np.fromiter(
+            (float(r or 0) for r in sell_returns), dtype=np.float64, count=len(sell_returns)
         )
-        if start_date:
-            sell_query = sell_query.filter(Trade.trade_date >= start_date)
-        if end_date:
-            sell_query = sell_query.filter(Trade.trade_date <= end_date)
-        sell_trades = sell_query.all()
 
-        # 청산 포지션
-        pos_query = (
-            self.db.query(Position)
-            .filter(Position.exit_date.isnot(None))
-            .order_by(Position.exit_date)
-        )
-        if start_date:
-            pos_query = pos_query.filter(Position.exit_date >= start_date)
-        if end_date:
-            pos_query = pos_query.filter(Position.exit_date <= end_date)
-        closed_positions = pos_query.all()
+        # 청산 포지션 보유일/수익률 (리스크 지표와 같은 로더, 인스턴스 안에서 한 번만 조회)
+        pcts, _, days_held = self._load_closed_positions(start_date, end_date)
 
-        total_sell_trades = len(sell_trades)
+        total_sell_trades = len(sell_pcts)
 
         if total_sell_trades < 2:
             return {
@@ -369,30 +381,65 @@ class AnalysisService:
                 "frequency_analysis": None,
             }
 
+        sell_stats = self._get_sell_trade_stats(sell_conditions)
+
         return {
             "total_sell_trades": total_sell_trades,
-            "expectancy": self._calc_expectancy(sell_trades),
-            "win_loss_ratio": self._calc_win_loss_ratio(sell_trades),
-            "holding_period": self._calc_holding_period(closed_positions),
-            "sequential_pattern": self._calc_sequential_pattern(sell_trades),
-            "weekday_performance": self._calc_weekday_performance(sell_trades),
-            "frequency_analysis": self._calc_frequency_analysis(sell_trades),
+            "expectancy": self._calc_expectancy(sell_stats),
+            "win_loss_ratio": self._calc_win_loss_ratio(sell_stats),
+            "holding_period": self._calc_holding_period(days_held, pcts),
+            "sequential_pattern": self._calc_sequential_pattern(sell_pcts),
+            "weekday_performance": self._calc_weekday_performance(sell_conditions),
+            "frequency_analysis": self._calc_frequency_analysis(sell_conditions),
         }
 
-    def _calc_expectancy(self, trades: list) -> dict:
+    def _sell_trade_conditions(self, start_date: date | None, end_date: date | None) -> list:
+        """실현손익이 있는 매도 거래 필터 조건."""
+        conditions = [
+            Trade.trade_type.in_([TradeType.SELL, TradeType.PARTIAL_SELL]),
+            Trade.realized_profit.isnot(None),
+        ]
+        if start_date:
+            conditions.append(Trade.trade_date >= start_date)
+        if end_date:
+            conditions.append(Trade.trade_date <= end_date)
+        return conditions
+
+    def _get_sell_trade_stats(self, sell_conditions: list):
+        """매도 거래 승/패 집계 (조건부 집계 쿼리 1회).
+
+        수익/손실 구분: 기대값은 실현손익 기준, 손익비는 실현수익률 기준.
+        """
+        profit = Trade.realized_profit
+        return_pct = Trade.realized_return_pct
+        is_win = profit > 0
+        is_loss = profit < 0
+        return self.db.execute(
+            select(
+                func.count().label("total"),
+                func.count(case((is_win, 1))).label("win_count"),
+                func.count(case((is_loss, 1))).label("loss_count"),
+                func.avg(case((is_win, profit))).label("avg_win_amount"),
+                func.avg(case((is_loss, profit))).label("avg_loss_amount"),
+                func.avg(case((is_win, func.coalesce(return_pct, 0)))).label("avg_win_pct"),
+                func.avg(case((is_loss, func.coalesce(return_pct, 0)))).label("avg_loss_pct"),
+                func.avg(case((return_pct > 0, return_pct))).label("avg_gain_pct"),
+                func.avg(case((return_pct < 0, return_pct))).label("avg_drop_pct"),
+            ).where(*sell_conditions)
+        ).one()
+
+    def _calc_expectancy(self, stats) -> dict:
         """기대값: (승률 × 평균수익) - (패률 × 평균손실)."""
-        wins = [t for t in trades if float(t.realized_profit or 0) > 0]
-        losses = [t for t in trades if float(t.realized_profit or 0) < 0]
-        total = len(trades)
+        total = stats.total
 
-        win_rate = len(wins) / total if total else 0
-        loss_rate = len(losses) / total if total else 0
+        win_rate = stats.win_count / total if total else 0
+        loss_rate = stats.loss_count / total if total else 0
 
-        avg_win_amount = sum(float(t.realized_profit) for t in wins) / len(wins) if wins else 0
-        avg_loss_amount = abs(sum(float(t.realized_profit) for t in losses) / len(losses)) if losses else 0
+        avg_win_amount = float(stats.avg_win_amount or 0)
+        avg_loss_amount = abs(float(stats.avg_loss_amount or 0))
 
-        avg_win_pct = sum(float(t.realized_return_pct or 0) for t in wins) / len(wins) if wins else 0
-        avg_loss_pct = abs(sum(float(t.realized_return_pct or 0) for t in losses) / len(losses)) if losses else 0
+        avg_win_pct = float(stats.avg_win_pct or 0)
+        avg_loss_pct = abs(float(stats.avg_loss_pct or 0))
 
         expectancy = (win_rate * avg_win_amount) - (loss_rate * avg_loss_amount)
         expectancy_pct = (win_rate * avg_win_pct) - (loss_rate * avg_loss_pct)
@@ -409,13 +456,10 @@ class AnalysisService:
             "is_positive": expectancy > 0,
         }
 
-    def _calc_win_loss_ratio(self, trades: list) -> dict:
+    def _calc_win_loss_ratio(self, stats) -> dict:
         """평균 손익비 = 평균수익률 / 평균손실률."""
-        wins = [t for t in trades if float(t.realized_return_pct or 0) > 0]
-        losses = [t for t in trades if float(t.realized_return_pct or 0) < 0]
-
-        avg_win_pct = sum(float(t.realized_return_pct) for t in wins) / len(wins) if wins else 0
-        avg_loss_pct = abs(sum(float(t.realized_return_pct) for t in losses) / len(losses)) if losses else 0
+        avg_win_pct = float(stats.avg_gain_pct or 0)
+        avg_loss_pct = abs(float(stats.avg_drop_pct or 0))
 
         ratio = avg_win_pct / avg_loss_pct if avg_loss_pct > 0 else 0
 
@@ -436,43 +480,20 @@ class AnalysisService:
             "comment": comment,
         }
 
-    def _calc_holding_period(self, positions: list) -> dict:
+    def _calc_holding_period(self, days: np.ndarray, rets: np.ndarray) -> dict:
         """보유기간 분석: 수익/손실 매매별 평균 보유일, 구간별 통계."""
-        if not positions:
+        if not len(days):
             return {
                 "avg_win_days": 0, "avg_loss_days": 0,
                 "diagnosis": "데이터 부족", "by_period": [],
             }
 
-        win_days = []
-        loss_days = []
-        period_buckets = {
-            "1주 이내": {"min": 0, "max": 7, "trades": []},
-            "1-2주": {"min": 8, "max": 14, "trades": []},
-            "2-4주": {"min": 15, "max": 28, "trades": []},
-            "1개월+": {"min": 29, "max": 9999, "trades": []},
-        }
-
-        for pos in positions:
-            days = pos.days_held or 0
-            ret = pos.realized_return_pct
-            if ret is None:
-                continue
-            ret = float(ret)
-            is_win = ret > 0
-
-            if is_win:
-                win_days.append(days)
-            else:
-                loss_days.append(days)
-
-            for label, bucket in period_buckets.items():
-                if bucket["min"] <= days <= bucket["max"]:
-                    bucket["trades"].append({"is_win": is_win, "return_pct": ret})
-                    break
+        is_win = rets > 0
 
-        avg_win = sum(win_days) / len(win_days) if win_days else 0
-        avg_loss = sum(loss_days) / len(loss_days) if loss_days else 0
+        win_days = days[is_win]
+        loss_days = days[~is_win]
+        avg_win = float(win_days.mean()) if len(win_days) else 0
+        avg_loss = float(loss_days.mean()) if len(loss_days) else 0
 
         # 진단
         if avg_loss > 0 and avg_win > 0:
@@ -485,15 +506,19 @@ class AnalysisService:
         else:
             diagnosis = "분석에 필요한 데이터가 부족합니다."
 
+        # 보유일 구간: 0-7 / 8-14 / 15-28 / 29-9999일 (구간 밖은 제외)
+        period_labels = ["1주 이내", "1-2주", "2-4주", "1개월+"]
+        bucket_idx = np.digitize(days, [0, 8, 15, 29, 10000])
+
         by_period = []
-        for label, bucket in period_buckets.items():
-            ts = bucket["trades"]
-            count = len(ts)
+        for bucket, label in enumerate(period_labels, start=1):
+            bucket_rets = rets[bucket_idx == bucket]
+            count = len(bucket_rets)
             if count == 0:
                 by_period.append({"period": label, "count": 0, "win_rate": 0, "avg_return_pct": 0})
                 continue
-            wins = sum(1 for t in ts if t["is_win"])
-            avg_ret = sum(t["return_pct"] for t in ts) / count
+            wins = int((bucket_rets > 0).sum())
+            avg_ret = float(bucket_rets.mean())
             by_period.append({
                 "period": label,
                 "count": count,
@@ -508,43 +533,34 @@ class AnalysisService:
             "by_period": by_period,
         }
 
-    def _calc_sequential_pattern(self, trades: list) -> dict:
+    def _calc_sequential_pattern(self, pcts: np.ndarray) -> dict:
         """승패 후 매매 패턴 분석: 복수매매/자만매매 감지."""
-        if len(trades) < 3:
+        if len(pcts) < 3:
             return {
                 "after_win": None, "after_loss": None, "after_streak_loss": None,
                 "revenge_trading_detected": False, "overconfidence_detected": False,
             }
 
-        results = [float(t.realized_return_pct or 0) for t in trades]
-        overall_win_rate = sum(1 for r in results if r > 0) / len(results) * 100
-        overall_avg_return = sum(results) / len(results)
-
-        after_win_results = []
-        after_loss_results = []
-        after_streak_loss_results = []
-
-        for i in range(1, len(results)):
-            prev = results[i - 1]
-            curr = results[i]
+        overall_win_rate = int((pcts > 0).sum()) / len(pcts) * 100
+        overall_avg_return = float(pcts.mean())
 
-            if prev > 0:
-                after_win_results.append(curr)
-            else:
-                after_loss_results.append(curr)
+        # 직전 매매 결과 기준으로 다음 매매 수익률 분류
+        prev_win = pcts[:-1] > 0
+        after_win_results = pcts[1:][prev_win]
+        after_loss_results = pcts[1:][~prev_win]
 
-            # 2연패 후
-            if i >= 2 and results[i - 1] <= 0 and results[i - 2] <= 0:
-                after_streak_loss_results.append(curr)
+        # 2연패 후
+        streak_loss = (pcts[:-2] <= 0) & (pcts[1:-1] <= 0)
+        after_streak_loss_results = pcts[2:][streak_loss]
 
-        def _stats(rs):
-            if not rs:
+        def _stats(rs: np.ndarray):
+            if not len(rs):
                 return {"count": 0, "win_rate": 0, "avg_return_pct": 0}
-            wins = sum(1 for r in rs if r > 0)
+            wins = int((rs > 0).sum())
             return {
                 "count": len(rs),
                 "win_rate": round(wins / len(rs) * 100, 1),
-                "avg_return_pct": round(sum(rs) / len(rs), 2),
+                "avg_return_pct": round(float(rs.mean()), 2),
             }
 
         after_win = _stats(after_win_results)
@@ -571,39 +587,41 @@ class AnalysisService:
             "overconfidence_detected": overconfidence,
         }
 
-    def _calc_weekday_performance(self, trades: list) -> dict:
-        """요일별 매매 성과."""
+    def _calc_weekday_performance(self, sell_conditions: list) -> dict:
+        """요일별 매매 성과 (요일별 집계는 DB에서)."""
         weekday_names = ["월", "화", "수", "목", "금"]
-        buckets: dict = {i: [] for i in range(5)}
 
-        for t in trades:
-            td = t.trade_date
-            if td is None:
-                continue
-            wd = td.weekday()
-            if wd < 5:
-                buckets[wd].append({
-                    "return_pct": float(t.realized_return_pct or 0),
-                    "profit": float(t.realized_profit or 0),
-                })
+        # PostgreSQL dow: 일=0, 월=1 ... 토=6
+        dow = extract("dow", Trade.trade_date)
+        return_pct = func.coalesce(Trade.realized_return_pct, 0)
+        rows = self.db.execute(
+            select(
+                dow,
+                func.count(),
+                func.avg(return_pct),
+                func.sum(case((return_pct > 0, 1), else_=0)),
+                func.sum(func.coalesce(Trade.realized_profit, 0)),
+            )
+            .where(*sell_conditions, dow.between(1, 5))
+            .group_by(dow)
+        ).all()
+        stats = {int(wd) - 1: (count, avg_ret, wins, profit) for wd, count, avg_ret, wins, profit in rows}
 
         by_weekday = []
         for i in range(5):
-            ts = buckets[i]
-            count = len(ts)
-            if count == 0:
+            if i not in stats:
                 by_weekday.append({
                     "day": weekday_names[i], "count": 0,
                     "win_rate": 0, "avg_return_pct": 0, "total_profit": 0,
                 })
                 continue
-            wins = sum(1 for t in ts if t["return_pct"] > 0)
+            count, avg_ret, wins, profit = stats[i]
             by_weekday.append({
                 "day": weekday_names[i],
                 "count": count,
                 "win_rate": round(wins / count * 100, 1),
-                "avg_return_pct": round(sum(t["return_pct"] for t in ts) / count, 2),
-                "total_profit": round(sum(t["profit"] for t in ts), 0),
+                "avg_return_pct": round(float(avg_ret), 2),
+                "total_profit": round(float(profit), 0),
             })
 
         active = [d for d in by_weekday if d["count"] > 0]
@@ -616,51 +634,56 @@ class AnalysisService:
             "worst_day": worst_day,
         }
 
-    def _calc_frequency_analysis(self, trades: list) -> dict:
-        """매매 빈도 분석: 주간별 그룹핑, 과매매 경고."""
-        weekly: dict = defaultdict(list)
-
-        for t in trades:
-            td = t.trade_date
-            if td is None:
-                continue
-            iso = td.isocalendar()
-            week_key = f"{iso[0]}-W{iso[1]:02d}"
-            weekly[week_key].append(float(t.realized_return_pct or 0))
+    def _calc_frequency_analysis(self, sell_conditions: list) -> dict:
+        """매매 빈도 분석: 주간별 그룹핑(DB 집계), 과매매 경고."""
+        # ISO 주차 키 (예: 2024-W05)
+        week_key = func.to_char(Trade.trade_date, 'IYYY-"W"IW')
+        return_pct = func.coalesce(Trade.realized_return_pct, 0)
+        weeks = self.db.execute(
+            select(
+                week_key,
+                func.count(),
+                func.sum(return_pct),
+                func.sum(case((return_pct > 0, 1), else_=0)),
+            )
+            .where(*sell_conditions)
+            .group_by(week_key)
+            .order_by(week_key)
+        ).all()
 
-        if not weekly:
+        if not weeks:
             return {
                 "avg_trades_per_week": 0,
                 "high_freq_stats": None, "low_freq_stats": None,
                 "overtrading_warning": False, "weekly_data": [],
             }
 
-        weeks_sorted = sorted(weekly.keys())
-        counts = [len(weekly[w]) for w in weeks_sorted]
+        counts = [count for _, count, _, _ in weeks]
         avg_per_week = sum(counts) / len(counts)
-        median_count = sorted(counts)[len(counts) // 2]
-
-        high_freq_returns = []
-        low_freq_returns = []
-        for w in weeks_sorted:
-            rs = weekly[w]
-            if len(rs) > median_count:
-                high_freq_returns.extend(rs)
-            else:
-                low_freq_returns.extend(rs)
-
-        def _freq_stats(rs):
-            if not rs:
+        # 중앙값(짝수면 위쪽)만 필요하므로 전체 정렬 대신 부분 정렬
+        mid = len(counts) // 2
+        median_count = int(np.partition(counts, mid)[mid])
+
+        # [건수, 수익률 합, 승수]
+        high_freq = [0, 0.0, 0]
+        low_freq = [0, 0.0, 0]
+        for _, count, total_return, wins in weeks:
+            bucket = high_freq if count > median_count else low_freq
+            bucket[0] += count
+            bucket[1] += float(total_return)
+            bucket[2] += wins
+
+        def _freq_stats(count, total_return, wins):
+            if not count:
                 return {"count": 0, "win_rate": 0, "avg_return_pct": 0}
-            wins = sum(1 for r in rs if r > 0)
             return {
-                "count": len(rs),
-                "win_rate": round(wins / len(rs) * 100, 1),
-                "avg_return_pct": round(sum(rs) / len(rs), 2),
+                "count": count,
+                "win_rate": round(wins / count * 100, 1),
+                "avg_return_pct": round(total_return / count, 2),
             }
 
-        high_stats = _freq_stats(high_freq_returns)
-        low_stats = _freq_stats(low_freq_returns)
+        high_stats = _freq_stats(*high_freq)
+        low_stats = _freq_stats(*low_freq)
 
         overtrading = (
             high_stats["count"] >= 5
@@ -669,17 +692,15 @@ class AnalysisService:
         )
 
         # 최근 12주 데이터
-        recent_weeks = weeks_sorted[-12:]
-        weekly_data = []
-        for w in recent_weeks:
-            rs = weekly[w]
-            wins = sum(1 for r in rs if r > 0)
-            weekly_data.append({
-                "week": w,
-                "trade_count": len(rs),
-                "win_rate": round(wins / len(rs) * 100, 1) if rs else 0,
-                "avg_return_pct": round(sum(rs) / len(rs), 2) if rs else 0,
-            })
+        weekly_data = [
+            {
+                "week": week,
+                "trade_count": count,
+                "win_rate": round(wins / count * 100, 1),
+                "avg_return_pct": round(float(total_return) / count, 2),
+            }
+            for week, count, total_return, wins in weeks[-12:]
+        ]
 
         return {
             "avg_trades_per_week": round(avg_per_week, 1),
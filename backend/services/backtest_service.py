@@ -11,6 +11,7 @@ from dataclasses import dataclass, field
 from datetime import date, timedelta
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -69,6 +70,31 @@ class SimState:
     cooldown: dict = field(default_factory=dict)  # code -> unblock_day_idx
 
 
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """누적합 차분으로 구한 window일 이동평균. 앞쪽 window-1개는 NaN."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def _rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """window일 이동 최대값. 데이터가 window일 미만인 앞쪽은 그때까지의 최대값."""
+    out = np.maximum.accumulate(values)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).max(axis=1)
+    return out
+
+
+def _rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """window일 이동 최소값. 데이터가 window일 미만인 앞쪽은 그때까지의 최소값."""
+    out = np.minimum.accumulate(values)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).min(axis=1)
+    return out
+
+
 def params_hash(params: BacktestRequest) -> str:
     raw = json.dumps(params.model_dump(), default=str, sort_keys=True)
     return hashlib.md5(raw.encode()).hexdigest()[:12]
@@ -180,13 +206,21 @@ class BacktestService:
                 lows.append(float(c.low_price))
                 closes.append(float(c.close_price))
                 volumes.append(float(c.volume))
+            highs, lows = np.array(highs), np.array(lows)
+            closes, volumes = np.array(closes), np.array(volumes)
             ohlcv_map[code] = {
                 "dates": dates,
                 "opens": np.array(opens),
-                "highs": np.array(highs),
-                "lows": np.array(lows),
-                "closes": np.array(closes),
-                "volumes": np.array(volumes),
+                "highs": highs,
+                "lows": lows,
+                "closes": closes,
+                "volumes": volumes,
+                # 이동 지표 (각 값은 해당일 포함 과거 데이터만 사용)
+                "ma120": _rolling_mean(closes, 120),
+                "vol_ma5": _rolling_mean(volumes, 5),
+                "vol_ma20": _rolling_mean(volumes, 20),
+                "high_60": _rolling_max(highs, 60),
+                "low_60": _rolling_min(lows, 60),
             }
         return ohlcv_map, code_to_name
 
@@ -277,7 +311,7 @@ class BacktestService:
                     # MA120 이격도 계산
                     ma120_deviation = 0.0
                     if ohlcv_idx >= 120:
-                        ma120_val = float(np.mean(data["closes"][ohlcv_idx - 119:ohlcv_idx + 1]))
+                        ma120_val = float(data["ma120"][ohlcv_idx])
                         if ma120_val > 0:
                             ma120_deviation = (close - ma120_val) / ma120_val * 100
 
@@ -336,7 +370,7 @@ class BacktestService:
 
                     ma_deviation_triggered = False
                     if params.ma_deviation_exit_pct > 0 and ohlcv_idx >= 120:
-                        ma120 = float(np.mean(data["closes"][ohlcv_idx - 119:ohlcv_idx + 1]))
+                        ma120 = float(data["ma120"][ohlcv_idx])
                         if ma120 > 0:
                             deviation = (close - ma120) / ma120 * 100
                             if deviation >= params.ma_deviation_exit_pct:
@@ -477,45 +511,42 @@ class BacktestService:
             if today_idx is None:
                 continue
 
-            # ★★★ 미래 차단: today_idx까지만 슬라이스 ★★★
-            end = today_idx + 1
-            sliced = {
-                "dates": data["dates"][:end],
-                "opens": data["opens"][:end],
-                "highs": data["highs"][:end],
-                "lows": data["lows"][:end],
-                "closes": data["closes"][:end],
-                "volumes": data["volumes"][:end],
-            }
-
-            if len(sliced["closes"]) < 40:
+            if today_idx + 1 < 40:
                 continue
 
-            # 기본 잡주 필터
-            current_price = float(sliced["closes"][-1])
+            # 기본 잡주 필터 (미리 계산한 이동 지표를 today_idx 위치에서 조회)
+            current_price = float(data["closes"][today_idx])
             if current_price < 2000:
                 continue
-            avg_vol_20d = float(np.mean(sliced["volumes"][-20:])) if len(sliced["volumes"]) >= 20 else float(np.mean(sliced["volumes"]))
+            avg_vol_20d = float(data["vol_ma20"][today_idx])
 
             # TOP 필터 (강화): 거래대금>=10억, 60일위치<70%, 거래량비>1.5
             min_trading_value = 1_000_000_000 if top_mode else 1_000_000_000
             if current_price * avg_vol_20d < min_trading_value:
                 continue
-            n60 = min(60, len(sliced["closes"]))
-            high_60d = float(np.max(sliced["highs"][-n60:]))
-            low_60d = float(np.min(sliced["lows"][-n60:]))
+            high_60d = float(data["high_60"][today_idx])
+            low_60d = float(data["low_60"][today_idx])
             pct_60d = (current_price - low_60d) / (high_60d - low_60d) * 100 if high_60d > low_60d else 50
             max_pct = 70 if top_mode else 70
             if pct_60d > max_pct:
                 continue
-            vol_ratio = 1.0
-            if len(sliced["volumes"]) >= 20:
-                vol_5d = float(np.mean(sliced["volumes"][-5:]))
-                vol_20d = float(np.mean(sliced["volumes"][-20:]))
-                vol_ratio = vol_5d / vol_20d if vol_20d > 0 else 0
-                min_vol_ratio = 1.5 if top_mode else 1.5
-                if vol_ratio < min_vol_ratio:
-                    continue
+            vol_5d = float(data["vol_ma5"][today_idx])
+            vol_20d = avg_vol_20d
+            vol_ratio = vol_5d / vol_20d if vol_20d > 0 else 0
+            min_vol_ratio = 1.5 if top_mode else 1.5
+            if vol_ratio < min_vol_ratio:
+                continue
+
+            # ★★★ 미래 차단: 디텍터에는 today_idx까지만 슬라이스해서 전달 ★★★
+            end = today_idx + 1
+            sliced = {
+                "dates": data["dates"][:end],
+                "opens": data["opens"][:end],
+                "highs": data["highs"][:end],
+                "lows": data["lows"][:end],
+                "closes": data["closes"][:end],
+                "volumes": data["volumes"][:end],
+            }
 
             common = self._ps._calc_common(sliced)
 
@@ -9,7 +9,7 @@ from typing import Optional
 from core.timezone import today_kst
 
 
-from sqlalchemy import select, delete, and_
+from sqlalchemy import select, delete, and_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert
 
@@ -19,6 +19,47 @@ from services.price_service import get_price_service
 logger = logging.getLogger(__name__)
 
 
+OHLCV_COPY_COLUMNS = (
+    "stock_code", "trade_date", "open_price", "high_price",
+    "low_price", "close_price", "volume", "created_at",
+)
+
+
+async def copy_ohlcv_records(db: AsyncSession, records: list[tuple]) -> int:
+    """COPY로 임시 테이블에 적재 후 INSERT ... SELECT 한 번으로 stock_ohlcv에 upsert (대량 적재용).
+
+    records: OHLCV_COPY_COLUMNS 순서의 튜플. 기존 행은 일반 upsert 경로와 같이 가격/거래량을 갱신한다.
+    행마다 INSERT 문을 보내지 않아 빠르지만, 최종 INSERT는 일반 INSERT와 같이
+    WAL 기록과 인덱스 갱신/충돌 검사를 거친다. 커밋은 호출자가 한다 (임시 테이블은 커밋 시 삭제).
+    같은 트랜잭션에서 여러 번 호출해도 되도록 임시 테이블을 재사용하고 매번 비운다.
+    """
+    if not records:
+        return 0
+
+    columns = ", ".join(OHLCV_COPY_COLUMNS)
+    await db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS tmp_ohlcv (LIKE stock_ohlcv INCLUDING DEFAULTS) ON COMMIT DROP"
+    ))
+    await db.execute(text("TRUNCATE tmp_ohlcv"))
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "tmp_ohlcv", records=records, columns=list(OHLCV_COPY_COLUMNS),
+    )
+    # DISTINCT ON: 한 배치에 같은 (종목, 날짜)가 두 번 있으면 DO UPDATE가 실패하므로 하나만 반영
+    await db.execute(text(f"""
+        INSERT INTO stock_ohlcv ({columns})
+        SELECT DISTINCT ON (stock_code, trade_date) {columns} FROM tmp_ohlcv
+        ON CONFLICT (stock_code, trade_date) DO UPDATE SET
+            open_price = EXCLUDED.open_price,
+            high_price = EXCLUDED.high_price,
+            low_price = EXCLUDED.low_price,
+            close_price = EXCLUDED.close_price,
+            volume = EXCLUDED.volume
+    """))
+    return len(records)
+
+
 def is_trading_day(d: date) -> bool:
     """주말이 아닌 거래일인지 확인 (공휴일은 KIS API가 자체 필터)."""
     return d.weekday() < 5  # 월(0)~금(4)
@@ -236,6 +277,24 @@ class OHLCVService:
             await self.db.rollback()
             return False
 
+    async def get_stock_codes(self) -> list[str]:
+        """OHLCV가 저장된 종목코드 목록.
+
+        SELECT DISTINCT는 전체 행을 스캔하므로, stock_code 인덱스를 따라
+        다음 코드로 건너뛰는 재귀 CTE(loose index scan)로 종목 수만큼만 조회한다.
+        """
+        stmt = text("""
+            WITH RECURSIVE t AS (
+                SELECT min(stock_code) AS c FROM stock_ohlcv
+                UNION ALL
+                SELECT (SELECT min(stock_code) FROM stock_ohlcv WHERE stock_code > t.c)
+                FROM t WHERE t.c IS NOT NULL
+            )
+            SELECT c FROM t WHERE c IS NOT NULL
+        """)
+        result = await self.db.execute(stmt)
+        return [row[0] for row in result.all()]
+
     async def get_stats(self) -> dict:
         """OHLCV 저장 통계."""
         from sqlalchemy import func
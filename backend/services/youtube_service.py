@@ -39,8 +39,7 @@ class YouTubeService:
         tickers = set()
         for idea in ideas:
             if idea.tickers:
-                for ticker in idea.tickers:
-                    tickers.add(ticker)
+                tickers.update(idea.tickers)
         return list(tickers)
 
     async def collect_videos(
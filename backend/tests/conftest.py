@@ -1,4 +1,6 @@
 """pytest 설정 및 fixtures."""
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -9,14 +11,17 @@ from core.database import Base, get_db
 from main import app
 
 
-# 테스트용 인메모리 SQLite DB
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# 테스트용 DB (기본: 인메모리 SQLite, TEST_DATABASE_URL 지정 시 해당 PostgreSQL 테스트 DB)
+SQLALCHEMY_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+else:
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
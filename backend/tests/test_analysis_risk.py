@@ -0,0 +1,74 @@
+"""리스크 지표 계산 헬퍼 테스트 (단순 반복문 계산과 비교)."""
+import random
+
+import numpy as np
+import pytest
+
+from services.analysis_service import AnalysisService
+
+
+def _loop_mdd(pcts, exit_dates):
+    if not pcts:
+        return {"max_drawdown_pct": 0, "peak_date": None, "trough_date": None}
+    cumulative = peak = max_dd = 0.0
+    peak_date, trough_date = exit_dates[0], None
+    for pct, exit_date in zip(pcts, exit_dates):
+        cumulative += pct
+        if cumulative > peak:
+            peak, peak_date = cumulative, exit_date
+        if peak - cumulative > max_dd:
+            max_dd, trough_date = peak - cumulative, exit_date
+    return {"max_drawdown_pct": round(max_dd, 2), "peak_date": peak_date, "trough_date": trough_date}
+
+
+def _loop_streaks(pcts):
+    if not pcts:
+        return {"max_win_streak": 0, "max_loss_streak": 0, "current_streak": 0, "current_type": None}
+    best = {"win": 0, "loss": 0}
+    current, current_type = 0, None
+    for pct in pcts:
+        kind = "win" if pct > 0 else "loss"
+        current = current + 1 if kind == current_type else 1
+        current_type = kind
+        best[kind] = max(best[kind], current)
+    return {
+        "max_win_streak": best["win"],
+        "max_loss_streak": best["loss"],
+        "current_streak": current,
+        "current_type": current_type,
+    }
+
+
+def _random_pcts(seed):
+    rnd = random.Random(seed)
+    n = rnd.choice([1, 2, 5, 30, 100])
+    return [rnd.choice([0.0, round(rnd.uniform(-15, 15), 2)]) for _ in range(n)]
+
+
+class TestRiskHelpers:
+    """_calc_mdd / _calc_streaks 테스트."""
+
+    @pytest.fixture
+    def service(self):
+        return AnalysisService(None)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_mdd_matches_loop(self, service, seed):
+        pcts = _random_pcts(seed)
+        exit_dates = [f"2024-01-{i % 28 + 1:02d}" for i in range(len(pcts))]
+        assert service._calc_mdd(np.array(pcts), exit_dates) == _loop_mdd(pcts, exit_dates)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_streaks_match_loop(self, service, seed):
+        pcts = _random_pcts(seed)
+        assert service._calc_streaks(np.array(pcts) > 0) == _loop_streaks(pcts)
+
+    def test_empty(self, service):
+        empty = np.array([], dtype=float)
+        assert service._calc_mdd(empty, []) == _loop_mdd([], [])
+        assert service._calc_streaks(empty > 0) == _loop_streaks([])
+
+    def test_no_drawdown(self, service):
+        """계속 오르기만 하면 낙폭 0, 저점 없음."""
+        result = service._calc_mdd(np.array([1.0, 2.0, 3.0]), ["a", "b", "c"])
+        assert result == {"max_drawdown_pct": 0.0, "peak_date": "c", "trough_date": None}
@@ -0,0 +1,200 @@
+"""분석 서비스 DB 집계 테스트 (PostgreSQL 전용 함수 사용 → TEST_DATABASE_URL 지정 시에만 실행)."""
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from models import InvestmentIdea, Position, IdeaType, IdeaStatus, Trade, TradeType
+from services.analysis_service import AnalysisService
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="PostgreSQL 테스트 DB 필요 (TEST_DATABASE_URL)",
+)
+
+
+def _add_idea(db, idea_type=IdeaType.RESEARCH, status=IdeaStatus.EXITED):
+    idea = InvestmentIdea(
+        type=idea_type,
+        tickers=["005930"],
+        thesis="테스트 아이디어",
+        expected_timeframe_days=30,
+        target_return_pct=Decimal("10"),
+        status=status,
+    )
+    db.add(idea)
+    db.flush()
+    return idea
+
+
+def _add_position(db, idea, entry_price, exit_price=None):
+    position = Position(
+        idea_id=idea.id,
+        ticker="005930",
+        entry_price=Decimal(str(entry_price)),
+        entry_date=date(2024, 1, 2),
+        quantity=10,
+        exit_price=Decimal(str(exit_price)) if exit_price is not None else None,
+        exit_date=date(2024, 2, 1) if exit_price is not None else None,
+    )
+    db.add(position)
+    db.flush()
+    return position
+
+
+def _add_trade(db, position, trade_date, profit, pct, trade_type=TradeType.SELL):
+    db.add(Trade(
+        position_id=position.id,
+        trade_type=trade_type,
+        trade_date=trade_date,
+        price=Decimal("100"),
+        quantity=1,
+        realized_profit=Decimal(str(profit)) if profit is not None else None,
+        realized_return_pct=Decimal(str(pct)) if pct is not None else None,
+    ))
+
+
+@pytest.fixture
+def position(db):
+    return _add_position(db, _add_idea(db), 100)
+
+
+class TestSellTradeStats:
+    """_get_sell_trade_stats 테스트."""
+
+    def test_counts_and_averages(self, db, position):
+        _add_trade(db, position, date(2024, 1, 1), 100, 5)
+        _add_trade(db, position, date(2024, 1, 2), 300, 15, TradeType.PARTIAL_SELL)
+        _add_trade(db, position, date(2024, 1, 3), -50, -2)
+        _add_trade(db, position, date(2024, 1, 4), 0, None)
+        _add_trade(db, position, date(2024, 1, 5), None, None)  # 실현손익 없음 → 제외
+        _add_trade(db, position, date(2024, 1, 5), 999, 50, TradeType.BUY)  # 매수 → 제외
+        db.commit()
+
+        service = AnalysisService(db)
+        stats = service._get_sell_trade_stats(service._sell_trade_conditions(None, None))
+
+        assert stats.total == 4
+        assert stats.win_count == 2
+        assert stats.loss_count == 1
+        assert float(stats.avg_win_amount) == 200
+        assert float(stats.avg_loss_amount) == -50
+        assert float(stats.avg_win_pct) == 10
+        assert float(stats.avg_loss_pct) == -2
+        assert float(stats.avg_gain_pct) == 10
+        assert float(stats.avg_drop_pct) == -2
+
+    def test_date_range(self, db, position):
+        _add_trade(db, position, date(2023, 12, 29), 100, 5)
+        _add_trade(db, position, date(2024, 1, 3), -50, -2)
+        _add_trade(db, position, date(2024, 2, 1), 100, 5)
+        db.commit()
+
+        service = AnalysisService(db)
+        stats = service._get_sell_trade_stats(
+            service._sell_trade_conditions(date(2024, 1, 1), date(2024, 1, 31))
+        )
+
+        assert stats.total == 1
+        assert stats.win_count == 0
+        assert stats.loss_count == 1
+        assert stats.avg_win_amount is None
+
+
+class TestWeekdayPerformance:
+    """_calc_weekday_performance 테스트."""
+
+    def test_groups_by_weekday(self, db, position):
+        _add_trade(db, position, date(2024, 1, 1), 100, 5)   # 월
+        _add_trade(db, position, date(2024, 1, 8), -30, -1)  # 월
+        _add_trade(db, position, date(2024, 1, 3), 50, 2)    # 수
+        _add_trade(db, position, date(2024, 1, 6), 500, 9)   # 토 → 제외
+        db.commit()
+
+        service = AnalysisService(db)
+        result = service._calc_weekday_performance(service._sell_trade_conditions(None, None))
+        by_day = {d["day"]: d for d in result["by_weekday"]}
+
+        assert [d["day"] for d in result["by_weekday"]] == ["월", "화", "수", "목", "금"]
+        assert by_day["월"] == {
+            "day": "월", "count": 2, "win_rate": 50.0, "avg_return_pct": 2.0, "total_profit": 70,
+        }
+        assert by_day["수"]["count"] == 1
+        assert by_day["수"]["win_rate"] == 100.0
+        assert by_day["화"]["count"] == 0
+        assert result["best_day"] == "수"
+        assert result["worst_day"] == "월"
+
+    def test_empty(self, db):
+        service = AnalysisService(db)
+        result = service._calc_weekday_performance(service._sell_trade_conditions(None, None))
+
+        assert all(d["count"] == 0 for d in result["by_weekday"])
+        assert result["best_day"] is None
+        assert result["worst_day"] is None
+
+
+class TestFrequencyAnalysis:
+    """_calc_frequency_analysis 테스트."""
+
+    def test_groups_by_iso_week(self, db, position):
+        # 2024-W01: 3건, 2024-W02: 1건, 2025-W01(2024-12-30, ISO 연도 경계): 1건
+        _add_trade(db, position, date(2024, 1, 1), 100, 4)
+        _add_trade(db, position, date(2024, 1, 3), -50, -2)
+        _add_trade(db, position, date(2024, 1, 5), -50, -2)
+        _add_trade(db, position, date(2024, 1, 9), 100, 6)
+        _add_trade(db, position, date(2024, 12, 30), 100, 3)
+        db.commit()
+
+        service = AnalysisService(db)
+        result = service._calc_frequency_analysis(service._sell_trade_conditions(None, None))
+
+        assert [w["week"] for w in result["weekly_data"]] == ["2024-W01", "2024-W02", "2025-W01"]
+        assert result["weekly_data"][0] == {
+            "week": "2024-W01", "trade_count": 3, "win_rate": 33.3, "avg_return_pct": 0.0,
+        }
+        assert result["avg_trades_per_week"] == round(5 / 3, 1)
+        # 주간 건수 중앙값 1 초과인 주(W01)만 고빈도
+        assert result["high_freq_stats"] == {"count": 3, "win_rate": 33.3, "avg_return_pct": 0.0}
+        assert result["low_freq_stats"] == {"count": 2, "win_rate": 100.0, "avg_return_pct": 4.5}
+        assert result["overtrading_warning"] is False
+
+    def test_empty(self, db):
+        service = AnalysisService(db)
+        result = service._calc_frequency_analysis(service._sell_trade_conditions(None, None))
+
+        assert result["weekly_data"] == []
+        assert result["high_freq_stats"] is None
+
+
+class TestPerformanceByType:
+    """get_performance_by_type 테스트."""
+
+    def test_groups_exited_positions_by_type(self, db):
+        research = _add_idea(db, IdeaType.RESEARCH)
+        _add_position(db, research, 100, 110)
+        _add_position(db, research, 100, 95)
+        _add_position(db, research, 100)  # 미청산 → 제외
+        chart = _add_idea(db, IdeaType.CHART)
+        _add_position(db, chart, 50, 60)
+        active = _add_idea(db, IdeaType.CHART, IdeaStatus.ACTIVE)
+        _add_position(db, active, 100, 200)  # 청산 상태가 아닌 아이디어 → 제외
+        db.commit()
+
+        result = AnalysisService(db).get_performance_by_type()
+
+        assert result["research"]["count"] == 2
+        assert result["research"]["avg_return"] == pytest.approx(2.5)
+        assert result["research"]["win_rate"] == 0.5
+        assert result["chart"]["count"] == 1
+        assert result["chart"]["avg_return"] == pytest.approx(20.0)
+        assert result["chart"]["win_rate"] == 1.0
+
+    def test_empty(self, db):
+        result = AnalysisService(db).get_performance_by_type()
+
+        assert result == {
+            "research": {"count": 0, "avg_return": None, "win_rate": None},
+            "chart": {"count": 0, "avg_return": None, "win_rate": None},
+        }
@@ -0,0 +1,56 @@
+"""백테스트 이동 지표 헬퍼 테스트 (단순 반복문 계산과 비교)."""
+import numpy as np
+import pytest
+
+from services.backtest_service import _rolling_max, _rolling_mean, _rolling_min
+
+
+def _loop_mean(values, window):
+    return [
+        sum(values[i - window + 1:i + 1]) / window if i >= window - 1 else None
+        for i in range(len(values))
+    ]
+
+
+def _loop_max(values, window):
+    return [max(values[max(0, i - window + 1):i + 1]) for i in range(len(values))]
+
+
+def _loop_min(values, window):
+    return [min(values[max(0, i - window + 1):i + 1]) for i in range(len(values))]
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    return rng.integers(1_000, 90_000, size=130).astype(float)
+
+
+class TestRollingHelpers:
+    """_rolling_mean / _rolling_max / _rolling_min 테스트."""
+
+    @pytest.mark.parametrize("window", [1, 5, 20, 60, 120])
+    def test_rolling_mean(self, series, window):
+        result = _rolling_mean(series, window)
+        expected = _loop_mean(series.tolist(), window)
+        assert len(result) == len(series)
+        assert np.isnan(result[:window - 1]).all()
+        assert result[window - 1:] == pytest.approx(expected[window - 1:])
+
+    @pytest.mark.parametrize("window", [1, 5, 60])
+    def test_rolling_max_min(self, series, window):
+        assert _rolling_max(series, window).tolist() == _loop_max(series.tolist(), window)
+        assert _rolling_min(series, window).tolist() == _loop_min(series.tolist(), window)
+
+    def test_window_longer_than_series(self):
+        """데이터가 window보다 짧으면 평균은 전부 NaN, 최대/최소는 그때까지의 값."""
+        values = np.array([3.0, 1.0, 4.0, 1.0, 5.0])
+        assert np.isnan(_rolling_mean(values, 20)).all()
+        assert _rolling_max(values, 60).tolist() == [3.0, 3.0, 4.0, 4.0, 5.0]
+        assert _rolling_min(values, 60).tolist() == [3.0, 1.0, 1.0, 1.0, 1.0]
+
+    def test_empty(self):
+        empty = np.array([], dtype=float)
+        assert len(_rolling_mean(empty, 20)) == 0
+        assert len(_rolling_max(empty, 60)) == 0
+        assert len(_rolling_min(empty, 60)) == 0
@@ -0,0 +1,32 @@
+"""네이버 재무 교차검증 셀 파싱 헬퍼 테스트."""
+import pytest
+
+from scripts.cross_validate_naver import _parse_int
+
+
+def _loop_parse_int(v):
+    if v in ("", "-"):
+        return None
+    sign = -1 if v[0] == "-" else 1
+    digits = v[1:] if sign < 0 else v
+    value = 0
+    for ch in digits:
+        if ch not in "0123456789":
+            return None
+        value = value * 10 + (ord(ch) - ord("0"))
+    return sign * value
+
+
+class TestParseInt:
+    """_parse_int 테스트 (자리별 반복 파싱과 비교)."""
+
+    @pytest.mark.parametrize("cell", [
+        "0", "7", "1234", "-56", "-0", "0012",
+        "", "-", "--5", "N/A", "12.5", "1,234", " 12", "+5", "1_000",
+    ])
+    def test_matches_loop(self, cell):
+        assert _parse_int(cell) == _loop_parse_int(cell)
+
+    def test_blank_and_dash_are_none(self):
+        assert _parse_int("") is None
+        assert _parse_int("-") is None
@@ -0,0 +1,31 @@
+"""CSV 마이그레이션 정수 연산 헬퍼 테스트."""
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import pytest
+
+from scripts.migrate_trades_csv import _round_div
+
+
+def _decimal_round_div(n, d):
+    return int((Decimal(n) / Decimal(d)).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+
+
+class TestRoundDiv:
+    """_round_div 테스트 (Decimal ROUND_HALF_EVEN과 비교)."""
+
+    @pytest.mark.parametrize("n, d", [
+        (0, 3), (1, 3), (2, 3), (5, 2), (7, 2), (9, 2), (10, 4), (14, 4),
+        (7_000_000 * 10 + 7_150_000 * 3, 13), (123_456_789, 1_000),
+    ])
+    def test_matches_decimal(self, n, d):
+        assert _round_div(n, d) == _decimal_round_div(n, d)
+
+    def test_ties_round_to_even(self):
+        assert _round_div(5, 2) == 2
+        assert _round_div(7, 2) == 4
+        assert _round_div(1, 2) == 0
+
+    def test_exhaustive_small(self):
+        for d in range(1, 30):
+            for n in range(0, 300):
+                assert _round_div(n, d) == _decimal_round_div(n, d)